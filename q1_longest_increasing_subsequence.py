@@ -1,5 +1,9 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import bisect
+import itertools
+import os
 
 
 def lis_dp(arr: List[int]) -> int:
@@ -23,12 +27,30 @@ def lis_binary_search(arr: List[int]) -> int:
     if not arr:
         return 0
     
-    # tails[i] is the smallest tail of all increasing subsequences of length i+1
-    tails = []
+    stream = LISStream()
+    stream.extend(arr)
+    return len(stream)
+
+
+class LISStream:
+    
+    # Incremental LIS engine: values are fed one at a time (or in chunks) and
+    # only the tails array is kept, so memory is O(LIS length), not O(input).
     
-    for num in arr:
+    def __init__(self, tails: Optional[Iterable[int]] = None, count: int = 0,
+                 strict: bool = True):
+        # tails[i] is the smallest tail of all increasing subsequences of length i+1
+        self.tails: List[int] = list(tails) if tails is not None else []
+        self.count = count  # Number of values consumed so far
+        # Non-strict (non-decreasing) runs let equal values extend a subsequence
+        self.strict = strict
+        self._bisect = bisect.bisect_left if strict else bisect.bisect_right
+    
+    def push(self, num: int) -> int:
+        tails = self.tails
+        
         # Find the position where num should be inserted
-        pos = bisect.bisect_left(tails, num)
+        pos = self._bisect(tails, num)
         
         if pos == len(tails):
             # num is greater than all elements in tails, extend the sequence
@@ -36,8 +58,130 @@ def lis_binary_search(arr: List[int]) -> int:
         else:
             # Replace tails[pos] with num (smaller tail is better)
             tails[pos] = num
+        
+        self.count += 1
+        return len(tails)
+    
+    def extend(self, values: Iterable[int]) -> int:
+        # Consumes any iterable lazily, so generators and unbounded iterators
+        # are never materialized
+        tails = self.tails
+        find = self._bisect
+        consumed = 0
+        
+        for num in values:
+            pos = find(tails, num)
+            if pos == len(tails):
+                tails.append(num)
+            else:
+                tails[pos] = num
+            consumed += 1
+        
+        self.count += consumed
+        return len(tails)
+    
+    @property
+    def length(self) -> int:
+        return len(self.tails)
+    
+    def __len__(self) -> int:
+        return len(self.tails)
     
-    return len(tails)
+    def checkpoint(self) -> Tuple[int, Tuple[int, ...], bool]:
+        # Immutable snapshot of the engine state: (values consumed, tails, strict)
+        return self.count, tuple(self.tails), self.strict
+    
+    def restore(self, state: Tuple[int, Tuple[int, ...], bool]) -> None:
+        count, tails, strict = state
+        self.count = count
+        self.tails = list(tails)
+        self.strict = strict
+        self._bisect = bisect.bisect_left if strict else bisect.bisect_right
+    
+    @classmethod
+    def from_checkpoint(cls, state: Tuple[int, Tuple[int, ...], bool]) -> "LISStream":
+        count, tails, strict = state
+        return cls(tails, count, strict)
+
+
+def longest_non_decreasing_subsequence(arr: List[int]) -> int:
+    
+    stream = LISStream(strict=False)
+    stream.extend(arr)
+    return len(stream)
+
+
+def longest_decreasing_subsequence(arr: List[int], strict: bool = True) -> int:
+    
+    # A decreasing subsequence of arr is an increasing one of the negated values
+    stream = LISStream(strict=strict)
+    stream.extend(-num for num in arr)
+    return len(stream)
+
+
+class FenwickMax:
+    
+    # Prefix-maximum Fenwick tree over positions 0..size-1 (values only grow)
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+    
+    def update(self, pos: int, value) -> None:
+        tree = self.tree
+        i = pos + 1
+        while i <= self.size:
+            if tree[i] < value:
+                tree[i] = value
+            i += i & -i
+    
+    def query(self, pos: int):
+        # Maximum over positions [0, pos), 0 if empty
+        tree = self.tree
+        best = 0
+        i = pos
+        while i > 0:
+            if tree[i] > best:
+                best = tree[i]
+            i -= i & -i
+        return best
+
+
+def weighted_lis(arr: List[int], weights: Optional[List] = None, strict: bool = True,
+                 decreasing: bool = False):
+    
+    if not arr:
+        return 0
+    
+    # Coordinate compression: values -> ranks 0..m-1 (reversed for decreasing)
+    values = sorted(set(arr))
+    m = len(values)
+    if decreasing:
+        rank = {value: m - 1 - i for i, value in enumerate(values)}
+    else:
+        rank = {value: i for i, value in enumerate(values)}
+    
+    # best[r] = best total weight of a subsequence ending with a value of rank r
+    fenwick = FenwickMax(m)
+    best_total = None
+    
+    for i, num in enumerate(arr):
+        r = rank[num]
+        weight = 1 if weights is None else weights[i]
+        
+        # Strict: extend from ranks < r; non-strict: from ranks <= r
+        total = weight + fenwick.query(r if strict else r + 1)
+        fenwick.update(r, total)
+        
+        if best_total is None or total > best_total:
+            best_total = total
+    
+    return best_total
+
+
+def max_sum_increasing_subsequence(arr: List[int]) -> int:
+    
+    return weighted_lis(arr, arr)
 
 
 def lis_with_sequence(arr: List[int]) -> tuple:
@@ -46,22 +190,31 @@ def lis_with_sequence(arr: List[int]) -> tuple:
         return 0, []
     
     n = len(arr)
-    dp = [1] * n
-    parent = [-1] * n  # To reconstruct the sequence
+    # Patience sorting: tails holds the tail values (for bisect), tail_index the
+    # position in arr of each tail, parent the predecessor of every element
+    tails = []
+    tail_index = array('i')
+    parent = array('i', [-1]) * n  # To reconstruct the sequence
     
-    for i in range(1, n):
-        for j in range(i):
-            if arr[j] < arr[i] and dp[j] + 1 > dp[i]:
-                dp[i] = dp[j] + 1
-                parent[i] = j
+    for i, num in enumerate(arr):
+        pos = bisect.bisect_left(tails, num)
+        
+        if pos == len(tails):
+            tails.append(num)
+            tail_index.append(i)
+        else:
+            tails[pos] = num
+            tail_index[pos] = i
+        
+        if pos > 0:
+            parent[i] = tail_index[pos - 1]
     
-    # Find the index with maximum LIS length
-    max_length = max(dp)
-    max_index = dp.index(max_length)
+    # The last tail ends a subsequence of maximum length
+    max_length = len(tails)
     
     # Reconstruct the sequence
     sequence = []
-    idx = max_index
+    idx = tail_index[-1]
     while idx != -1:
         sequence.append(arr[idx])
         idx = parent[idx]
@@ -70,6 +223,273 @@ def lis_with_sequence(arr: List[int]) -> tuple:
     return max_length, sequence
 
 
+def _lis_chunk(chunk, with_sequence: bool = False, ragged: bool = False) -> list:
+    
+    # A chunk is either a list of sequences, a block of rows of a 2-D NumPy
+    # array, or (if ragged) a (flat_values, offsets) pair
+    # (bisect on NumPy scalars is slow, so arrays are converted once per chunk)
+    if ragged:
+        flat, offsets = chunk
+        if hasattr(flat, "tolist"):
+            flat = flat.tolist()
+        rows = (flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1))
+    elif hasattr(chunk, "tolist"):
+        rows = chunk.tolist()
+    else:
+        rows = [row.tolist() if hasattr(row, "tolist") else row for row in chunk]
+    
+    solve = lis_with_sequence if with_sequence else lis_binary_search
+    return [solve(row) for row in rows]
+
+
+def _batch_chunks(sequences, chunk_size: int, ragged: bool = False) -> Iterator:
+    
+    if ragged:
+        # (flat_values, offsets) with sequence i at
+        # flat_values[offsets[i]:offsets[i + 1]]
+        flat, offsets = sequences
+        count = len(offsets) - 1
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            lo, hi = offsets[start], offsets[stop]
+            # Only the slice of the flat buffer is shipped to the worker
+            yield flat[lo:hi], [offsets[i] - lo for i in range(start, stop + 1)]
+    elif hasattr(sequences, "ndim") and sequences.ndim == 2:
+        # 2-D array: one row per sequence, blocks pickle as a single buffer
+        for start in range(0, len(sequences), chunk_size):
+            yield sequences[start:start + chunk_size]
+    else:
+        iterator = iter(sequences)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def lis_batch(sequences=None, workers: Optional[int] = None, with_sequence: bool = False,
+              chunk_size: Optional[int] = None,
+              ragged: Optional[Tuple[Sequence[int], Sequence[int]]] = None) -> list:
+    
+    # sequences: an iterable of sequences (lists, tuples, 1-D arrays) or a 2-D
+    # NumPy array; alternatively ragged=(flat_values, offsets)
+    if (sequences is None) == (ragged is None):
+        raise ValueError("Pass exactly one of sequences or ragged")
+    if ragged is not None:
+        sequences = ragged
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    if chunk_size is None:
+        if ragged is not None:
+            count = len(ragged[1]) - 1
+        elif hasattr(sequences, "__len__"):
+            count = len(sequences)
+        else:
+            count = 0
+        # A few chunks per worker keeps the pool busy when chunk costs differ
+        chunk_size = max(1, -(-count // (workers * 4))) if count else 1024
+    
+    is_ragged = ragged is not None
+    chunks = _batch_chunks(sequences, chunk_size, is_ragged)
+    
+    if workers <= 1:
+        results = [_lis_chunk(chunk, with_sequence, is_ragged) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields chunk results in submission order
+            results = list(pool.map(_lis_chunk, chunks, itertools.repeat(with_sequence),
+                                    itertools.repeat(is_ragged)))
+    
+    return [result for chunk in results for result in chunk]
+
+
+class RangeLISIndex:
+    
+    # Answers "LIS of arr[l:r]" for arbitrary (l, r) over a fixed array.
+    #
+    # Built on the seaweed (semi-local LCS) view of LIS: comb arr against its
+    # own sorted order and record, for every start position k, the column
+    # exit[k] where the seaweed entering above column k leaves the grid
+    # (n if it leaves on the right). Then
+    #     LIS(arr[l:r]) = #{k in [l, r) : exit[k] >= r}
+    # so every query is a 2-D dominance count.
+    #
+    # Memory:
+    #   build:          transient sort order, ranks and a max segment tree
+    #                   (Python list of < 4n ints), all released afterwards
+    #   exit / bottom:  2n 4-byte ints, kept
+    #   query():        merge-sort tree of ceil(log2 n) levels x n 4-byte ints,
+    #                   built on the first single query (~80 MB for n = 10^6)
+    #   query_many():   offline sweep, n + q ints, no merge-sort tree
+    # Build time is O((n + s) log n) for s seaweed swaps (about n log n on
+    # random input, more on adversarial orderings); query() is O(log^2 n) and
+    # query_many() is O((n + q) log n) for q queries.
+    
+    def __init__(self, arr: List[int]):
+        n = len(arr)
+        self.n = n
+        
+        # Rank values; equal values get decreasing ranks so they never chain
+        # (strictly increasing, like lis_binary_search)
+        order = sorted(range(n), key=lambda i: (arr[i], -i))
+        rank = array('i', [0]) * n
+        for r, i in enumerate(order):
+            rank[i] = r
+        del order
+        
+        # Max segment tree over the seaweed currently leaving each row.
+        # Seaweed ids: left seaweed of row r is n-1-r, top seaweed of column c is n+c
+        size = 1
+        while size < max(n, 1):
+            size <<= 1
+        tree = [-1] * (2 * size)
+        for r in range(n):
+            tree[size + r] = n - 1 - r
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        
+        def first_greater(pos: int, value: int) -> int:
+            # First row >= pos whose seaweed id is greater than value, or -1
+            if pos >= n:
+                return -1
+            i = pos + size
+            while True:
+                if tree[i] > value:
+                    while i < size:
+                        i <<= 1
+                        if tree[i] <= value:
+                            i += 1
+                    return i - size
+                while i & 1:
+                    i >>= 1
+                if i == 0:
+                    return -1
+                i += 1
+        
+        exit_column = array('i', [n]) * n
+        bottom = array('i', [-1]) * n  # bottom[c]: start k whose exit is c
+        
+        for c in range(n):
+            # The seaweed from the top of column c turns right at its match row;
+            # the one it displaces travels down, swapping with every larger id
+            # it meets (seaweeds cross at most once). The rows it swaps with
+            # are the running maxima below its match row.
+            p = rank[c]
+            carried = tree[size + p]
+            
+            records = [p]
+            q = first_greater(p + 1, carried)
+            while q != -1:
+                records.append(q)
+                q = first_greater(q + 1, tree[size + q])
+            
+            # Shift the seaweeds one record down; the last one exits the bottom
+            carried = tree[size + records[-1]]
+            for j in range(len(records) - 1, 0, -1):
+                tree[size + records[j]] = tree[size + records[j - 1]]
+            tree[size + p] = n + c
+            
+            # Restore the maxima above the touched leaves, bottom-up
+            for leaf in records:
+                i = (leaf + size) >> 1
+                while i:
+                    value = max(tree[2 * i], tree[2 * i + 1])
+                    if tree[i] == value:
+                        break
+                    tree[i] = value
+                    i >>= 1
+            
+            if carried >= n:
+                exit_column[carried - n] = c
+                bottom[c] = carried - n
+        
+        self.exit = exit_column
+        self.bottom = bottom
+        self._levels: Optional[List[array]] = None
+    
+    def _bounds(self, left: int, right: int) -> Tuple[int, int]:
+        # Slice semantics, including negative indices
+        left, right, _ = slice(left, right).indices(self.n)
+        return left, max(left, right)
+    
+    def _build_levels(self) -> List[array]:
+        # levels[j] holds exit values sorted within aligned blocks of 2**j
+        levels = [self.exit]
+        width = 1
+        while width < self.n:
+            prev = levels[-1]
+            width *= 2
+            level = array('i')
+            for start in range(0, self.n, width):
+                level.extend(sorted(prev[start:start + width]))
+            levels.append(level)
+        return levels
+    
+    def query(self, left: int, right: int) -> int:
+        left, right = self._bounds(left, right)
+        
+        if self._levels is None:
+            self._levels = self._build_levels()
+        levels = self._levels
+        
+        # Count k in [left, right) with exit[k] < right using aligned blocks
+        blocked = 0
+        pos = left
+        while pos < right:
+            j = 0
+            while pos % (2 << j) == 0 and pos + (2 << j) <= right:
+                j += 1
+            width = 1 << j
+            blocked += bisect.bisect_left(levels[j], right, pos, pos + width) - pos
+            pos += width
+        
+        return (right - left) - blocked
+    
+    def query_many(self, queries: Iterable[Tuple[int, int]]) -> List[int]:
+        bounds = [self._bounds(left, right) for left, right in queries]
+        answers = [0] * len(bounds)
+        
+        # Sweep right ends in increasing order; a start k is "blocked" for all
+        # right ends beyond exit[k], tracked in a Fenwick tree over k
+        n = self.n
+        fenwick = array('i', [0]) * (n + 1)
+        inserted = 0
+        swept = 0
+        bottom = self.bottom
+        
+        for qi in sorted(range(len(bounds)), key=lambda qi: bounds[qi][1]):
+            left, right = bounds[qi]
+            while swept < right:
+                k = bottom[swept]
+                if k != -1:
+                    i = k + 1
+                    while i <= n:
+                        fenwick[i] += 1
+                        i += i & -i
+                    inserted += 1
+                swept += 1
+            
+            # Blocked starts below left
+            below = 0
+            i = left
+            while i > 0:
+                below += fenwick[i]
+                i -= i & -i
+            
+            answers[qi] = (right - left) - (inserted - below)
+        
+        return answers
+    
+    def nbytes(self) -> int:
+        # Bytes held by the index arrays (excluding per-object overhead)
+        total = self.exit.itemsize * (len(self.exit) + len(self.bottom))
+        if self._levels is not None:
+            total += sum(level.itemsize * len(level) for level in self._levels[1:])
+        return total
+
+
 # Test the solutions
 if __name__ == "__main__":
     # Example from the problem
@@ -78,5 +498,41 @@ if __name__ == "__main__":
     print(f"LIS Length: {length}")
     print(f"One possible LIS: {sequence}")
     
+    # Streaming: feed values in chunks and checkpoint the state in between
+    stream = LISStream()
+    stream.extend(arr[:4])
+    state = stream.checkpoint()
+    stream.extend(iter(arr[4:]))
+    print(f"Streaming LIS Length: {len(stream)} after {stream.count} values")
+    print(f"Restored from checkpoint: {len(LISStream.from_checkpoint(state))}")
+    
+    # Batch throughput versus the serial loop
+    import random
+    import time
+    
+    batch = [[random.randint(0, 1000) for _ in range(100)] for _ in range(20000)]
+    
+    start = time.perf_counter()
+    serial = [lis_binary_search(seq) for seq in batch]
+    serial_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batched = lis_batch(batch)
+    batch_time = time.perf_counter() - start
+    
+    print(f"Serial loop: {len(batch) / serial_time:,.0f} sequences/sec")
+    print(f"lis_batch ({os.cpu_count()} workers): {len(batch) / batch_time:,.0f} sequences/sec")
+    print(f"Results match: {serial == batched}")
+    
+    # Range queries over a fixed array
+    index = RangeLISIndex(arr)
+    print(f"LIS of arr[2:7]: {index.query(2, 7)}")
+    print(f"Bulk queries: {index.query_many([(0, 9), (3, 6), (5, 9)])}")
+    
+    # Variants
+    print(f"Max-sum increasing subsequence: {max_sum_increasing_subsequence(arr)}")
+    print(f"Longest non-decreasing subsequence: {longest_non_decreasing_subsequence(arr)}")
+    print(f"Longest decreasing subsequence: {longest_decreasing_subsequence(arr)}")
+    
     
    
@@ -1,30 +1,674 @@
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, TextIO, Optional
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import itertools
+import math
+import os
+import sys
+import time
 
 
-def solve_sudoku(board: List[List[int]]) -> bool:
+# Bit d of an occupancy mask is set when digit d is used (bits 1..9)
+ALL_DIGITS = 0x3FE
+POPCOUNT = [bin(mask).count("1") for mask in range(1 << 10)]
+BOX_INDEX = [[(row // 3) * 3 + col // 3 for col in range(9)] for row in range(9)]
+
+# The 27 units (rows, columns, boxes) as lists of (row, col) cells
+UNITS = ([[(row, col) for col in range(9)] for row in range(9)] +
+         [[(row, col) for row in range(9)] for col in range(9)] +
+         [[(box_row + i, box_col + j) for i in range(3) for j in range(3)]
+          for box_row in range(0, 9, 3) for box_col in range(0, 9, 3)])
+
+
+# Flat layout: cell i = row * 9 + col, one byte per cell (0 = empty)
+ROW_OF = bytes(i // 9 for i in range(81))
+COL_OF = bytes(i % 9 for i in range(81))
+BOX_OF = bytes((i // 27) * 3 + (i % 9) // 3 for i in range(81))
+PEERS = tuple(
+    tuple(j for j in range(81) if j != i and
+          (ROW_OF[j] == ROW_OF[i] or COL_OF[j] == COL_OF[i] or BOX_OF[j] == BOX_OF[i]))
+    for i in range(81)
+)
+
+
+def solve_sudoku(board: List[List[int]], propagate: bool = True) -> bool:
+    
+    return SudokuSolver(board).solve(propagate)
+
+
+def count_solutions(board: List[List[int]], limit: int = 2) -> int:
+    
+    # Stops as soon as limit solutions are found; the board is left unchanged.
+    # count_solutions(board) == 1 checks that a puzzle is unique.
+    return SudokuSolver(board).count(limit)
+
+
+class SudokuSolver:
+    
+    # Backtracking engine that keeps row/column/box occupancy as bitmasks,
+    # updates them incrementally and always branches on the empty cell with
+    # the fewest candidates (minimum remaining values)
+    
+    def __init__(self, board: List[List[int]]):
+        self.board = board
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.empty: List[Tuple[int, int]] = []
+        self.consistent = True  # False if the givens already clash
+        self.trail: List[Tuple[int, int]] = []  # Cells filled by propagation
+        
+        for row in range(9):
+            for col in range(9):
+                num = board[row][col]
+                if num == 0:
+                    self.empty.append((row, col))
+                    continue
+                
+                bit = 1 << num
+                box = BOX_INDEX[row][col]
+                if (self.rows[row] | self.cols[col] | self.boxes[box]) & bit:
+                    self.consistent = False
+                self.rows[row] |= bit
+                self.cols[col] |= bit
+                self.boxes[box] |= bit
+    
+    def candidates(self, row: int, col: int) -> int:
+        used = self.rows[row] | self.cols[col] | self.boxes[BOX_INDEX[row][col]]
+        return ALL_DIGITS & ~used
+    
+    def place(self, row: int, col: int, num: int) -> None:
+        bit = 1 << num
+        self.board[row][col] = num
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[BOX_INDEX[row][col]] |= bit
+    
+    def remove(self, row: int, col: int, num: int) -> None:
+        bit = 1 << num
+        self.board[row][col] = 0
+        self.rows[row] &= ~bit
+        self.cols[col] &= ~bit
+        self.boxes[BOX_INDEX[row][col]] &= ~bit
+    
+    def solve(self, propagate: bool = True) -> bool:
+        if not self.consistent:
+            return False
+        
+        mark = len(self.trail)
+        if (not propagate or self.propagate()) and self._search():
+            return True
+        
+        # Leave the board as it was given
+        self.undo(mark)
+        return False
     
-    empty_cell = find_empty(board)
+    def count(self, limit: int = 2) -> int:
+        if not self.consistent or limit <= 0:
+            return 0
+        
+        mark = len(self.trail)
+        found = self._count(limit) if self.propagate() else 0
+        self.undo(mark)
+        return found
     
-    if empty_cell is None:
+    def propagate(self) -> bool:
+        # Naked and hidden singles to a fixpoint. Returns False on a
+        # contradiction; placements are recorded in self.trail for undo().
+        board = self.board
+        changed = True
+        
+        while changed:
+            changed = False
+            
+            # Naked singles: an empty cell with exactly one candidate
+            for row, col in self.empty:
+                if board[row][col]:
+                    continue
+                mask = self.candidates(row, col)
+                if mask == 0:
+                    return False
+                if mask & (mask - 1) == 0:
+                    self.place(row, col, mask.bit_length() - 1)
+                    self.trail.append((row, col))
+                    changed = True
+            
+            # Hidden singles: a digit with exactly one possible cell in a unit
+            for unit in UNITS:
+                used = once = twice = 0
+                for row, col in unit:
+                    num = board[row][col]
+                    if num:
+                        used |= 1 << num
+                        continue
+                    mask = self.candidates(row, col)
+                    twice |= once & mask
+                    once |= mask
+                
+                if (used | once) != ALL_DIGITS:
+                    # Some digit has nowhere to go in this unit
+                    return False
+                
+                singles = once & ~twice & ~used
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    for row, col in unit:
+                        if not board[row][col] and self.candidates(row, col) & bit:
+                            self.place(row, col, bit.bit_length() - 1)
+                            self.trail.append((row, col))
+                            changed = True
+                            break
+                    else:
+                        # An earlier single in this unit took its only cell
+                        return False
+            
+            if changed:
+                self.empty = [(row, col) for row, col in self.empty if not board[row][col]]
+        
         return True
     
-    row, col = empty_cell
+    def undo(self, mark: int = 0) -> None:
+        # Clears propagated cells back to the given trail length
+        board = self.board
+        while len(self.trail) > mark:
+            row, col = self.trail.pop()
+            self.remove(row, col, board[row][col])
+            self.empty.append((row, col))
     
-    for num in range(1, 10):
-        if is_valid(board, row, col, num):
-            board[row][col] = num
+    def _count(self, limit: int) -> int:
+        empty = self.empty
+        if not empty:
+            return 1
+        
+        index, mask = self._select_cell()
+        if mask == 0:
+            return 0
+        
+        empty[index], empty[-1] = empty[-1], empty[index]
+        row, col = empty.pop()
+        
+        found = 0
+        while mask and found < limit:
+            bit = mask & -mask
+            mask ^= bit
+            num = bit.bit_length() - 1
             
+            self.place(row, col, num)
+            found += self._count(limit - found)
+            self.remove(row, col, num)
+        
+        empty.append((row, col))
+        empty[index], empty[-1] = empty[-1], empty[index]
+        return found
+    
+    def _select_cell(self) -> Tuple[int, int]:
+        # Index into self.empty of the most constrained cell and its candidates
+        best_index, best_mask, best_count = -1, 0, 10
+        for i, (row, col) in enumerate(self.empty):
+            mask = self.candidates(row, col)
+            count = POPCOUNT[mask]
+            if count < best_count:
+                best_index, best_mask, best_count = i, mask, count
+                if count <= 1:
+                    break
+        return best_index, best_mask
+    
+    def _search(self) -> bool:
+        empty = self.empty
+        if not empty:
+            return True
+        
+        index, mask = self._select_cell()
+        if mask == 0:
+            # Dead end: some empty cell has no candidates
+            return False
+        
+        # Move the chosen cell to the end so it can be popped in O(1)
+        empty[index], empty[-1] = empty[-1], empty[index]
+        row, col = empty.pop()
+        
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            num = bit.bit_length() - 1
             
-            if solve_sudoku(board):
+            self.place(row, col, num)
+            if self._search():
                 return True
             
             # Backtrack: remove the number if it didn't lead to a solution
-            board[row][col] = 0
+            self.remove(row, col, num)
+        
+        empty.append((row, col))
+        empty[index], empty[-1] = empty[-1], empty[index]
+        return False
+
+
+class ExactCover:
+    
+    # Dancing Links (Algorithm X). Nodes live in parallel integer lists
+    # (left/right/up/down/column) indexed by node id instead of node objects.
+    # Node 0 is the root, nodes 1..num_columns are the column headers.
+    
+    def __init__(self, num_columns: int):
+        headers = num_columns + 1
+        self.num_columns = num_columns
+        self.left = [i - 1 for i in range(headers)]
+        self.left[0] = num_columns
+        self.right = [i + 1 for i in range(headers)]
+        self.right[num_columns] = 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        self.size = [0] * headers
+        self.row_of = [-1] * headers  # Row id owning each node
+        self.num_rows = 0
+    
+    def add_row(self, columns: Iterable[int]) -> int:
+        # columns are 0-based; returns the id of the new row
+        left, right, up, down = self.left, self.right, self.up, self.down
+        row_id = self.num_rows
+        first = -1
+        
+        for col in columns:
+            header = col + 1
+            node = len(down)
+            
+            # Insert at the bottom of the column
+            up.append(up[header])
+            down.append(header)
+            down[up[header]] = node
+            up[header] = node
+            self.column.append(header)
+            self.size[header] += 1
+            self.row_of.append(row_id)
+            
+            # Insert at the end of the row
+            if first == -1:
+                first = node
+                left.append(node)
+                right.append(node)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = node
+                left[first] = node
+        
+        self.num_rows += 1
+        return row_id
+    
+    def cover(self, c: int) -> None:
+        left, right, up, down, column, size = (
+            self.left, self.right, self.up, self.down, self.column, self.size)
+        left[right[c]] = left[c]
+        right[left[c]] = right[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                up[down[j]] = up[j]
+                down[up[j]] = down[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+    
+    def uncover(self, c: int) -> None:
+        left, right, up, down, column, size = (
+            self.left, self.right, self.up, self.down, self.column, self.size)
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                up[down[j]] = j
+                down[up[j]] = j
+                j = left[j]
+            i = up[i]
+        left[right[c]] = c
+        right[left[c]] = c
+    
+    def solutions(self) -> Iterator[List[int]]:
+        # Yields each exact cover as a list of row ids. The search keeps an
+        # explicit stack of chosen nodes, so depth is not bounded by recursion.
+        right, left, down, column, size = (
+            self.right, self.left, self.down, self.column, self.size)
+        chosen: List[int] = []
+        
+        while True:
+            if right[0] == 0:
+                yield [self.row_of[node] for node in chosen]
+                descend = False
+            else:
+                # Branch on the column with the fewest remaining rows
+                c = right[0]
+                best, best_size = c, size[c]
+                while c != 0 and best_size > 1:
+                    if size[c] < best_size:
+                        best, best_size = c, size[c]
+                    c = right[c]
+                c = best
+                descend = best_size > 0
+                if descend:
+                    self.cover(c)
+                    node = down[c]
+                    chosen.append(node)
+                    j = right[node]
+                    while j != node:
+                        self.cover(column[j])
+                        j = right[j]
+            
+            if descend:
+                continue
+            
+            # Backtrack to the deepest level that still has an untried row
+            while chosen:
+                node = chosen.pop()
+                c = column[node]
+                j = left[node]
+                while j != node:
+                    self.uncover(column[j])
+                    j = left[j]
+                
+                node = down[node]
+                if node != c:
+                    chosen.append(node)
+                    j = right[node]
+                    while j != node:
+                        self.cover(column[j])
+                        j = right[j]
+                    break
+                self.uncover(c)
+            else:
+                return
+
+
+def _sudoku_exact_cover(board: List[List[int]]) -> Tuple[ExactCover, List[Tuple[int, int, int]]]:
+    
+    # Builds the exact-cover matrix of an N^2 x N^2 board: one row per
+    # (row, col, digit) candidate, one column per cell / row-digit /
+    # col-digit / box-digit constraint
+    size = len(board)
+    box = math.isqrt(size)
+    if box * box != size or any(len(row) != size for row in board):
+        raise ValueError("Board must be N^2 x N^2 with N^2 rows of N^2 cells")
+    
+    cells = size * size
+    matrix = ExactCover(4 * cells)
+    candidates: List[Tuple[int, int, int]] = []
+    
+    for row in range(size):
+        for col in range(size):
+            given = board[row][col]
+            if not 0 <= given <= size:
+                raise ValueError(f"Invalid value {given} at ({row}, {col})")
+            
+            b = (row // box) * box + col // box
+            digits = [given] if given else range(1, size + 1)
+            for num in digits:
+                d = num - 1
+                matrix.add_row((row * size + col,
+                                cells + row * size + d,
+                                2 * cells + col * size + d,
+                                3 * cells + b * size + d))
+                candidates.append((row, col, num))
+    
+    return matrix, candidates
+
+
+def solve_sudoku_dlx(board: List[List[int]]) -> bool:
+    
+    # First-solution mode for any N^2 x N^2 board, filled in place
+    matrix, candidates = _sudoku_exact_cover(board)
+    
+    for solution in matrix.solutions():
+        for row_id in solution:
+            row, col, num = candidates[row_id]
+            board[row][col] = num
+        return True
     
-    # No valid number found, need to backtrack
     return False
 
 
+def count_sudoku_solutions_dlx(board: List[List[int]], limit: int = 2) -> int:
+    
+    # Counts solutions, stopping as soon as limit is reached
+    matrix, _ = _sudoku_exact_cover(board)
+    
+    count = 0
+    for _ in matrix.solutions():
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+class FlatBoard:
+    
+    # 81-byte board over any writable byte buffer (bytearray, memoryview,
+    # shared memory). Wrapping a buffer never copies it, so boards can be
+    # handed between processes and solved in place.
+    
+    __slots__ = ("cells",)
+    
+    def __init__(self, buffer=None):
+        if buffer is None:
+            buffer = bytearray(81)
+        cells = memoryview(buffer).cast("B")
+        if len(cells) != 81:
+            raise ValueError(f"Expected an 81-byte buffer, got {len(cells)} bytes")
+        self.cells = cells
+    
+    @classmethod
+    def from_string(cls, line: str) -> "FlatBoard":
+        line = line.strip()
+        if len(line) != 81:
+            raise ValueError(f"Expected 81 characters, got {len(line)}: {line!r}")
+        return cls(bytearray(0 if ch in "0." else int(ch) for ch in line))
+    
+    @classmethod
+    def from_rows(cls, board: List[List[int]]) -> "FlatBoard":
+        return cls(bytearray(num for row in board for num in row))
+    
+    def to_rows(self) -> List[List[int]]:
+        return [list(self.cells[row * 9:row * 9 + 9]) for row in range(9)]
+    
+    def __str__(self) -> str:
+        return "".join(map(str, self.cells))
+    
+    def candidates(self, i: int) -> int:
+        # Bitmask of digits not used by any peer of cell i
+        cells = self.cells
+        used = 0
+        for j in PEERS[i]:
+            used |= 1 << cells[j]
+        return ALL_DIGITS & ~used
+    
+    def solve(self) -> bool:
+        return solve_flat(self.cells)
+
+
+def solve_flat(cells) -> bool:
+    
+    # Non-recursive MRV backtracking directly on an 81-byte buffer. The stack
+    # holds (cell, untried candidates) per filled cell; on failure every
+    # filled cell is cleared again.
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    empty = []
+    
+    for i in range(81):
+        num = cells[i]
+        if num == 0:
+            empty.append(i)
+            continue
+        bit = 1 << num
+        r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+        if (rows[r] | cols[c] | boxes[b]) & bit:
+            return False
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+    
+    stack: List[Tuple[int, int]] = []
+    total = len(empty)
+    
+    while True:
+        depth = len(stack)
+        if depth == total:
+            return True
+        
+        # Pick the most constrained of the remaining empty cells
+        best_pos, best_mask, best_count = depth, 0, 10
+        for pos in range(depth, total):
+            i = empty[pos]
+            mask = ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+            count = POPCOUNT[mask]
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+        
+        if best_mask:
+            empty[depth], empty[best_pos] = empty[best_pos], empty[depth]
+            i = empty[depth]
+            bit = best_mask & -best_mask
+            stack.append((i, best_mask ^ bit))
+        else:
+            # Backtrack to the deepest cell with an untried candidate
+            while stack:
+                i, mask = stack[-1]
+                old = 1 << cells[i]
+                cells[i] = 0
+                rows[ROW_OF[i]] ^= old
+                cols[COL_OF[i]] ^= old
+                boxes[BOX_OF[i]] ^= old
+                if mask:
+                    bit = mask & -mask
+                    stack[-1] = (i, mask ^ bit)
+                    break
+                stack.pop()
+            else:
+                return False
+        
+        cells[i] = bit.bit_length() - 1
+        rows[ROW_OF[i]] |= bit
+        cols[COL_OF[i]] |= bit
+        boxes[BOX_OF[i]] |= bit
+
+
+def parse_puzzle(line: str) -> List[List[int]]:
+    
+    # Standard one-line format: 81 characters, digits with '0' or '.' for empty
+    line = line.strip()
+    if len(line) != 81:
+        raise ValueError(f"Expected 81 characters, got {len(line)}: {line!r}")
+    
+    board = []
+    for row in range(9):
+        board.append([0 if ch in "0." else int(ch) for ch in line[row * 9:row * 9 + 9]])
+    return board
+
+
+def format_puzzle(board: List[List[int]]) -> str:
+    
+    return "".join(str(num) for row in board for num in row)
+
+
+def _solve_chunk(lines: List[str]) -> List[Tuple[Optional[str], float]]:
+    
+    # Worker task: (solution line, "" if unsolvable or None if the line is not
+    # a puzzle, solve seconds) per puzzle; a bad line never fails the chunk
+    results = []
+    for line in lines:
+        start = time.perf_counter()
+        try:
+            board = FlatBoard.from_string(line)
+        except ValueError:
+            results.append((None, 0.0))
+            continue
+        solution = str(board) if board.solve() else ""
+        results.append((solution, time.perf_counter() - start))
+    return results
+
+
+def _percentile(sorted_values, q: float) -> float:
+    
+    # Nearest-rank percentile of an already sorted sequence
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def solve_puzzle_stream(source: TextIO, sink: TextIO, workers: Optional[int] = None,
+                        chunk_size: int = 256, max_in_flight: Optional[int] = None) -> Dict[str, float]:
+    
+    # Reads one puzzle per line from source and writes one solution per line to
+    # sink in input order (an empty line for an unsolvable or malformed
+    # puzzle, counted as unsolved or invalid). Blank input lines are skipped,
+    # so output line N answers the N-th non-blank input line. At most
+    # max_in_flight chunks are queued, so memory stays bounded however long
+    # the input is.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * max(workers, 1)
+    
+    lines = (line for line in source if line.strip())
+    chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
+    
+    latencies = array('d')
+    unsolved = 0
+    invalid = 0
+    start = time.perf_counter()
+    
+    def write(results: List[Tuple[Optional[str], float]]) -> None:
+        nonlocal unsolved, invalid
+        for solution, elapsed in results:
+            if solution is None:
+                sink.write("\n")
+                invalid += 1
+                continue
+            sink.write(solution + "\n")
+            latencies.append(elapsed)
+            if not solution:
+                unsolved += 1
+    
+    if workers <= 1:
+        for chunk in chunks:
+            write(_solve_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                if len(pending) >= max_in_flight:
+                    # Backpressure: wait for the oldest chunk before reading more
+                    write(pending.popleft().result())
+                pending.append(pool.submit(_solve_chunk, chunk))
+            while pending:
+                write(pending.popleft().result())
+    
+    sink.flush()
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    
+    return {
+        "puzzles": len(latencies) + invalid,
+        "unsolved": unsolved,
+        "invalid": invalid,
+        "seconds": elapsed,
+        "puzzles_per_sec": (len(latencies) + invalid) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p90_ms": _percentile(ordered, 90) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
 def find_empty(board: List[List[int]]) -> Optional[Tuple[int, int]]:
    
     for i in range(9):
@@ -80,9 +724,7 @@ def is_valid_sudoku(board: List[List[int]]) -> bool:
   
     # Check all rows
     for row in board:
-        if sorted([x for x in row if x != 0]) != sorted(set([x for x in row if x != 0])):
-            return False
-        if 0 in row:
+        if sorted(row) != list(range(1, 10)):
             return False
     
     # Check all columns
@@ -104,8 +746,100 @@ def is_valid_sudoku(board: List[List[int]]) -> bool:
     return True
 
 
+def validate_boards(boards, report: bool = False, chunk_size: int = 1 << 16):
+    
+    # Vectorized check of many solved boards given as an (N, 9, 9) uint8 array.
+    # Returns a boolean mask of valid boards; with report=True also returns, per
+    # board, the first failing unit (0-8 rows, 9-17 columns, 18-26 boxes; -1 if
+    # valid), see unit_name().
+    import numpy as np
+    
+    boards = np.asarray(boards)
+    if boards.dtype != np.uint8:
+        if boards.dtype.kind not in "iu":
+            raise ValueError(f"Expected integer boards, got dtype {boards.dtype}")
+        # Out-of-range cells become 0 (invalid) instead of wrapping into 1..9
+        boards = np.where((boards >= 0) & (boards <= 9), boards, 0).astype(np.uint8)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError(f"Expected an (N, 9, 9) array, got shape {boards.shape}")
+    
+    # Digit d -> bit d; anything outside 1..9 -> 0, so it can never complete a unit
+    lookup = np.zeros(256, dtype=np.uint16)
+    lookup[1:10] = 1 << np.arange(1, 10, dtype=np.uint16)
+    
+    count = len(boards)
+    valid = np.empty(count, dtype=bool)
+    first_failure = np.empty(count, dtype=np.int8) if report else None
+    
+    # Chunks bound the temporary bitmask arrays (~200 bytes per board)
+    for start in range(0, count, chunk_size):
+        bits = lookup[boards[start:start + chunk_size]]
+        boxes = bits.reshape(-1, 3, 3, 3, 3)
+        
+        # A unit of 9 cells is valid iff the OR of its bits covers all digits
+        units = np.concatenate((
+            np.bitwise_or.reduce(bits, axis=2),
+            np.bitwise_or.reduce(bits, axis=1),
+            np.bitwise_or.reduce(np.bitwise_or.reduce(boxes, axis=4), axis=2).reshape(-1, 9),
+        ), axis=1) == ALL_DIGITS
+        
+        chunk_valid = units.all(axis=1)
+        valid[start:start + len(bits)] = chunk_valid
+        if report:
+            failure = np.argmin(units, axis=1).astype(np.int8)
+            failure[chunk_valid] = -1
+            first_failure[start:start + len(bits)] = failure
+    
+    if report:
+        return valid, first_failure
+    return valid
+
+
+def unit_name(index: int) -> str:
+    
+    # Human-readable name of a unit index reported by validate_boards
+    if index < 0:
+        return "valid"
+    kind = ("row", "column", "box")[index // 9]
+    return f"{kind} {index % 9}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    
+    parser = argparse.ArgumentParser(
+        description="Solve 81-character Sudoku puzzles, one per line. Blank lines are skipped; "
+                    "output line N is the solution to the N-th non-blank input line, "
+                    "or empty if it is unsolvable or malformed.")
+    parser.add_argument("input", help="puzzle file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="solution file, or - for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="puzzles per worker task")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="queued chunks (default: 2 x workers)")
+    args = parser.parse_args(argv)
+    
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        stats = solve_puzzle_stream(source, sink, args.workers, args.chunk_size, args.max_in_flight)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    
+    print(f"{stats['puzzles']} puzzles ({stats['unsolved']} unsolved, {stats['invalid']} invalid) in {stats['seconds']:.2f}s: "
+          f"{stats['puzzles_per_sec']:.0f} puzzles/sec", file=sys.stderr)
+    print(f"latency p50 {stats['p50_ms']:.3f} ms, p90 {stats['p90_ms']:.3f} ms, "
+          f"p99 {stats['p99_ms']:.3f} ms, max {stats['max_ms']:.3f} ms", file=sys.stderr)
+
+
 # Test the solution
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Batch mode: python q2_sudoku_solver.py puzzles.txt -o solutions.txt
+        main()
+        sys.exit(0)
+    
     # Example from the problem
     board = [
         [5, 3, 0, 0, 7, 0, 0, 0, 0],
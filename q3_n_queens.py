@@ -1,51 +1,147 @@
 
 
-from typing import List, Set
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
 
 
-def solve_n_queens(n: int) -> List[List[int]]:
+def solve_n_queens(n: int, partial: Optional[List[int]] = None,
+                   blocked: Optional[Iterable[Tuple[int, int]]] = None) -> List[List[int]]:
     
-    solutions = []
+    return list(iter_n_queens(n, partial=partial, blocked=blocked))
+
+
+def _constraint_masks(n: int, partial: Optional[List[int]] = None,
+                      blocked: Optional[Iterable[Tuple[int, int]]] = None) -> Optional[List[int]]:
+    
+    # Folds pre-placed queens (partial[row] = col, -1 or None for a free row)
+    # and blocked (row, col) cells into one bitmask of allowed columns per row,
+    # so the search prunes them like any other attacked square
+    if not partial and not blocked:
+        return None
+    
+    full = (1 << n) - 1
+    allowed = [full] * n
     
-    # Sets to track occupied columns and diagonals
-    cols: Set[int] = set()           # Occupied columns
-    diag1: Set[int] = set()          # Main diagonals (row - col)
-    diag2: Set[int] = set()        # Current solution being built   # Anti-diagonals (row + col)
+    for row, col in blocked or ():
+        if not (0 <= row < n and 0 <= col < n):
+            raise ValueError(f"Blocked cell ({row}, {col}) is off the board")
+        allowed[row] &= ~(1 << col)
     
-    current_solution: List[int] = []
+    if partial and len(partial) > n:
+        raise ValueError(f"Partial placement has {len(partial)} rows for n={n}")
     
-    def backtrack(row: int) -> None:
+    for row, col in enumerate(partial or ()):
+        if col is None or col < 0:
+            continue
+        if col >= n:
+            raise ValueError(f"Queen at ({row}, {col}) is off the board")
         
-        if row == n:
+        for r in range(n):
+            if r == row:
+                # A blocked or attacked fixed queen leaves this row empty
+                allowed[r] &= 1 << col
+                continue
+            d = abs(r - row)
+            attacked = 1 << col
+            if col + d < n:
+                attacked |= 1 << (col + d)
+            if col - d >= 0:
+                attacked |= 1 << (col - d)
+            allowed[r] &= ~attacked
+    
+    return allowed
+
+
+def iter_n_queens(n: int, compact: bool = False, partial: Optional[List[int]] = None,
+                  blocked: Optional[Iterable[Tuple[int, int]]] = None) -> Iterator:
+    
+    # Yields solutions lazily in the same (lexicographic) order as before,
+    # as lists of column positions or, with compact=True, as n-byte records.
+    # Only O(n) state is live at any time.
+    if n < 0:
+        return
+    if compact and n > 256:
+        raise ValueError("Compact records hold columns in one byte (n <= 256)")
+    
+    full = (1 << n) - 1
+    allowed = _constraint_masks(n, partial, blocked) or [full] * n
+    current_solution = bytearray(n) if compact else [0] * n
+    if n == 0:
+        yield bytes(current_solution) if compact else []
+        return
+    
+    # Per-row attack masks and untried free columns, kept on explicit stacks
+    cols = [0] * n
+    ld = [0] * n
+    rd = [0] * n
+    avail = [0] * n
+    avail[0] = allowed[0]
+    row = 0
+    
+    while row >= 0:
+        free = avail[row]
+        if not free:
+            # Backtrack: no untried column left in this row
+            row -= 1
+            continue
+        
+        bit = free & -free
+        avail[row] = free ^ bit
+        current_solution[row] = bit.bit_length() - 1
+        
+        if row == n - 1:
             # All queens placed successfully
-            solutions.append(current_solution.copy())
-            return
+            yield bytes(current_solution) if compact else list(current_solution)
+            continue
         
-        for col in range(n):
-            # Check if this position is safe
-            if col in cols or (row - col) in diag1 or (row + col) in diag2:
-                continue
-            
-            # Place the queen
-            cols.add(col)
-            diag1.add(row - col)
-            diag2.add(row + col)
-            current_solution.append(col)
-            
-            # Recurse to the next row
-            backtrack(row + 1)
-            
-            # Backtrack: remove the queen
-            cols.remove(col)
-            diag1.remove(row - col)
-            diag2.remove(row + col)
-            current_solution.pop()
+        next_cols = cols[row] | bit
+        next_ld = ((ld[row] | bit) << 1) & full
+        next_rd = (rd[row] | bit) >> 1
+        row += 1
+        cols[row], ld[row], rd[row] = next_cols, next_ld, next_rd
+        avail[row] = allowed[row] & ~(next_cols | next_ld | next_rd)
+
+
+def write_n_queens(n: int, path: str) -> int:
     
-    backtrack(0)
-    return solutions
+    # Streams every solution to a binary file as fixed n-byte records
+    # (byte i = column of the queen in row i); returns the solution count
+    count = 0
+    with open(path, "wb") as f:
+        for record in iter_n_queens(n, compact=True):
+            f.write(record)
+            count += 1
+    return count
 
 
-def solve_n_queens_one(n: int) -> List[int]:
+def read_n_queens(path: str, n: int) -> Iterator[List[int]]:
+    
+    # Reads back records written by write_n_queens, one solution at a time.
+    # n = 0 has one (empty) solution, which takes no bytes to store.
+    if n == 0:
+        yield []
+        return
+    with open(path, "rb") as f:
+        while True:
+            record = f.read(n)
+            if not record or len(record) < n:
+                return
+            yield list(record)
+
+
+# Above this size solve_n_queens_one switches from backtracking to the
+# explicit construction (first-solution backtracking gets erratic from n ~ 20)
+LARGE_N = 20
+
+
+def solve_n_queens_one(n: int, large: Optional[bool] = None) -> List[int]:
+    
+    if large is None:
+        large = n >= LARGE_N
+    if large:
+        return construct_n_queens(n)
     
     cols: Set[int] = set()
     diag1: Set[int] = set()
@@ -94,35 +190,228 @@ def print_board(solution: List[int]) -> None:
         print("+" + "---+" * n)
 
 
-def count_solutions(n: int) -> int:
+def count_solutions(n: int, workers: Optional[int] = None, partial: Optional[List[int]] = None,
+                    blocked: Optional[Iterable[Tuple[int, int]]] = None) -> int:
     
-    count = [0]  # Using list to allow modification in nested function
+    if workers is not None and workers > 1:
+        return count_solutions_parallel(n, workers, partial, blocked)
     
-    cols: Set[int] = set()
-    diag1: Set[int] = set()
-    diag2: Set[int] = set()
+    allowed = _constraint_masks(n, partial, blocked)
+    if allowed is None:
+        return count_solutions_bitboard(n)
+    return _count_allowed((1 << n) - 1, allowed, 0, 0, 0, 0)
+
+
+def _count_bits(full: int, cols: int, ld: int, rd: int) -> int:
+    
+    # cols/ld/rd are bitmasks of attacked columns in the current row: by a
+    # queen above, by a "\\" diagonal, and by a "/" diagonal
+    if cols == full:
+        return 1
+    
+    total = 0
+    avail = full & ~(cols | ld | rd)
+    while avail:
+        # Extract the lowest free column
+        bit = avail & -avail
+        avail ^= bit
+        total += _count_bits(full, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def _count_allowed(full: int, allowed: List[int], row: int, cols: int, ld: int, rd: int) -> int:
+    
+    # Same as _count_bits, restricted to the allowed columns of each row
+    if cols == full:
+        return 1
+    
+    total = 0
+    avail = allowed[row] & ~(cols | ld | rd)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        total += _count_allowed(full, allowed, row + 1, cols | bit,
+                                ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def _prefix_tasks(n: int, depth: int, allowed: Optional[List[int]] = None) -> List[Tuple[int, int, int, int]]:
+    
+    # Every valid placement of the first depth rows (depth >= 2) as independent
+    # subproblems (cols, ld, rd, weight). Left/right mirror symmetry: first-row
+    # queens only in the left half, weighted 2. For odd n the middle first-row
+    # column is halved on the second row instead, which can never be the
+    # middle column too. Constrained boards (allowed masks) are not symmetric,
+    # so every placement is enumerated with weight 1.
+    full = (1 << n) - 1
+    half = n // 2
+    left_half = (1 << half) - 1
+    tasks: List[Tuple[int, int, int, int]] = []
+    
+    def expand(cols: int, ld: int, rd: int, row: int, weight: int, restrict: int) -> None:
+        if row == depth or cols == full:
+            tasks.append((cols, ld, rd, weight))
+            return
+        avail = full & ~(cols | ld | rd) & restrict
+        if allowed is not None:
+            avail &= allowed[row]
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            expand(cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, row + 1, weight, full)
+    
+    if allowed is not None:
+        expand(0, 0, 0, 0, 1, full)
+        return tasks
+    
+    for col in range(half):
+        bit = 1 << col
+        expand(bit, (bit << 1) & full, bit >> 1, 1, 2, full)
+    
+    if n % 2:
+        bit = 1 << half
+        expand(bit, (bit << 1) & full, bit >> 1, 1, 2, left_half)
+    
+    return tasks
+
+
+def _count_task(full: int, task: Tuple[int, int, int, int], allowed: Optional[List[int]] = None,
+                row: int = 0) -> int:
+    
+    cols, ld, rd, weight = task
+    if allowed is not None:
+        return weight * _count_allowed(full, allowed, row, cols, ld, rd)
+    return weight * _count_bits(full, cols, ld, rd)
+
+
+def count_solutions_bitboard(n: int) -> int:
+    
+    if n <= 1:
+        return 1 if n >= 0 else 0
+    
+    full = (1 << n) - 1
+    return sum(_count_task(full, task) for task in _prefix_tasks(n, 2))
+
+
+def count_solutions_parallel(n: int, workers: Optional[int] = None, partial: Optional[List[int]] = None,
+                             blocked: Optional[Iterable[Tuple[int, int]]] = None,
+                             tasks_per_worker: int = 16) -> int:
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if n <= 3:
+        return count_solutions(n, partial=partial, blocked=blocked)
+    
+    allowed = _constraint_masks(n, partial, blocked)
+    
+    # Deepen the prefix until there are many more subproblems than workers, so
+    # uneven subtrees balance out as idle workers pull the next task
+    depth = 2
+    tasks = _prefix_tasks(n, depth, allowed)
+    while len(tasks) < workers * tasks_per_worker and depth < n - 1:
+        depth += 1
+        tasks = _prefix_tasks(n, depth, allowed)
+    
+    full = (1 << n) - 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_task, itertools.repeat(full), tasks,
+                            itertools.repeat(allowed), itertools.repeat(depth), chunksize=1))
+
+
+def construct_n_queens(n: int) -> List[int]:
+    
+    # Explicit O(n) placement (Hoffman, Loessi and Moore): queens in even
+    # columns then odd columns (1-based), patched when n % 6 is 2 or 3
+    if n in (2, 3) or n < 1:
+        return []
+    
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    
+    if n % 6 == 2:
+        # Swap 1 and 3, move 5 to the end
+        odds[0], odds[1] = odds[1], odds[0]
+        odds.remove(5)
+        odds.append(5)
+    elif n % 6 == 3:
+        # Move 2 to the end of the evens, 1 and 3 to the end of the odds
+        evens.remove(2)
+        evens.append(2)
+        odds = odds[2:] + [1, 3]
+    
+    return [col - 1 for col in evens + odds]
+
+
+def _symmetries(solution: List[int]) -> List[Tuple[int, ...]]:
     
-    def backtrack(row: int) -> None:
+    # The 8 images of a solution under rotations and reflections of the board
+    n = len(solution)
+    inverse = [0] * n  # inverse[col] = row of the queen in that column
+    for row, col in enumerate(solution):
+        inverse[col] = row
+    
+    last = n - 1
+    return [
+        tuple(solution),                                  # identity
+        tuple(last - col for col in solution),            # mirror left/right
+        tuple(reversed(solution)),                        # mirror top/bottom
+        tuple(last - col for col in reversed(solution)),  # rotate 180
+        tuple(inverse),                                   # main diagonal
+        tuple(last - row for row in inverse),             # rotate 90
+        tuple(reversed(inverse)),                         # rotate 270
+        tuple(last - row for row in reversed(inverse)),   # anti-diagonal
+    ]
+
+
+def iter_fundamental_n_queens(n: int) -> Iterator[Tuple[List[int], int]]:
+    
+    # Yields one canonical representative (the lexicographically smallest of
+    # its 8 images) per symmetry class, with the size of its orbit; the orbit
+    # sizes sum to count_solutions(n).
+    #
+    # Branches that cannot be canonical are cut during the search: with the
+    # first queen in column c0, every image must start at column >= c0, so
+    # c0 <= (n-1)/2, the last-row queen lies in columns [c0, n-1-c0], and the
+    # edge columns 0 and n-1 may only be used in rows [c0, n-1-c0] (the
+    # rotations and diagonal reflections turn those queens into first rows).
+    if n < 0:
+        return
+    if n <= 1:
+        yield list(range(n)), 1
+        return
+    
+    full = (1 << n) - 1
+    edges = 1 | (1 << (n - 1))
+    current_solution = [0] * n
+    
+    def backtrack(row: int, cols: int, ld: int, rd: int, c0: int) -> Iterator[Tuple[List[int], int]]:
         if row == n:
-            count[0] += 1
+            images = _symmetries(current_solution)
+            if all(images[0] <= image for image in images):
+                yield list(current_solution), len(set(images))
             return
         
-        for col in range(n):
-            if col in cols or (row - col) in diag1 or (row + col) in diag2:
-                continue
-            
-            cols.add(col)
-            diag1.add(row - col)
-            diag2.add(row + col)
-            
-            backtrack(row + 1)
-            
-            cols.remove(col)
-            diag1.remove(row - col)
-            diag2.remove(row + col)
+        avail = full & ~(cols | ld | rd)
+        if row == n - 1:
+            avail &= ((1 << (n - c0)) - 1) & ~((1 << c0) - 1)
+        elif row < c0 or row > n - 1 - c0:
+            avail &= ~edges
+        
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            current_solution[row] = bit.bit_length() - 1
+            yield from backtrack(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, c0)
     
-    backtrack(0)
-    return count[0]
+    for c0 in range((n - 1) // 2 + 1):
+        bit = 1 << c0
+        current_solution[0] = c0
+        yield from backtrack(1, bit, (bit << 1) & full, bit >> 1, c0)
+
+
+def count_fundamental_solutions(n: int) -> int:
+    
+    return sum(1 for _ in iter_fundamental_n_queens(n))
 
 
 def is_valid_solution(solution: List[int]) -> bool:
@@ -133,12 +422,12 @@ def is_valid_solution(solution: List[int]) -> bool:
     if len(set(solution)) != n:
         return False
     
-    # Check diagonals
-    for i in range(n):
-        for j in range(i + 1, n):
-            # Same diagonal if |row_diff| == |col_diff|
-            if abs(i - j) == abs(solution[i] - solution[j]):
-                return False
+    # Check diagonals: queens share a diagonal iff they share row - col or
+    # row + col, so each must also be unique (O(n) instead of comparing pairs)
+    if len({row - col for row, col in enumerate(solution)}) != n:
+        return False
+    if len({row + col for row, col in enumerate(solution)}) != n:
+        return False
     
     return True
 
@@ -1,12 +1,126 @@
-from typing import List, Optional, Set
-from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from array import array
+from collections import OrderedDict, defaultdict, deque
+import mmap
+import struct
+import sys
 
 
-def word_ladder_length(begin_word: str, end_word: str, word_list: List[str]) -> int:
+class WordGraph:
+    
+    # One-letter-edit graph built once from a word list. Each word is indexed
+    # under its L wildcard patterns ("hot" -> "*ot", "h*t", "ho*"), so the
+    # neighbours of a word are L bucket lookups instead of 25 * L candidate
+    # strings probed against a set.
+    #
+    # A union-find over the same graph is kept up to date as words are added,
+    # so connected() answers "is there any ladder" without a search. Words in
+    # one bucket are mutually adjacent, so each new word only needs a union
+    # with the first member of each of its buckets.
+    
+    WILDCARD = "*"
+    
+    def __init__(self, word_list: Iterable[str] = ()):
+        self.words: Set[str] = set()
+        self.buckets: Dict[str, List[str]] = defaultdict(list)
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+        for word in word_list:
+            self.add(word)
+    
+    @classmethod
+    def patterns(cls, word: str) -> List[str]:
+        return [word[:i] + cls.WILDCARD + word[i + 1:] for i in range(len(word))]
+    
+    def add(self, word: str) -> bool:
+        # Returns False if the word was already present
+        if word in self.words:
+            return False
+        self.words.add(word)
+        self._parent[word] = word
+        self._size[word] = 1
+        for pattern in self.patterns(word):
+            bucket = self.buckets[pattern]
+            if bucket:
+                self._union(word, bucket[0])
+            bucket.append(word)
+        return True
+    
+    def _find(self, word: str) -> str:
+        parent = self._parent
+        while parent[word] != word:
+            parent[word] = parent[parent[word]]  # Path halving
+            word = parent[word]
+        return word
+    
+    def _union(self, a: str, b: str) -> None:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size.pop(b)
+    
+    def components(self, word: str) -> Set[str]:
+        # Component roots word belongs to; a word outside the dictionary can
+        # touch several through its neighbours
+        if word in self.words:
+            return {self._find(word)}
+        buckets = self.buckets
+        return {self._find(buckets[p][0]) for p in self.patterns(word) if buckets.get(p)}
+    
+    def component_size(self, word: str) -> int:
+        return sum(self._size[root] for root in self.components(word))
+    
+    def connected(self, begin_word: str, end_word: str) -> bool:
+        if begin_word == end_word:
+            return True
+        return not self.components(begin_word).isdisjoint(self.components(end_word))
+    
+    def neighbors(self, word: str) -> List[str]:
+        # Works for words outside the dictionary too (e.g. a begin_word)
+        result = []
+        buckets = self.buckets
+        for pattern in self.patterns(word):
+            bucket = buckets.get(pattern)
+            if bucket:
+                result.extend(other for other in bucket if other != word)
+        return result
+    
+    def __contains__(self, word: object) -> bool:
+        return word in self.words
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def __iter__(self):
+        return iter(self.words)
+
+
+def _neighbor_source(word_list) -> Tuple[Set[str], Callable[[str], List[str]]]:
+    
+    # A prebuilt graph (anything with neighbors()) is used as-is; a raw word
+    # list falls back to a set plus per-letter candidate generation
+    if hasattr(word_list, "neighbors"):
+        return word_list, word_list.neighbors
     word_set = set(word_list)
+    return word_set, lambda word: get_neighbors(word, word_set)
+
+
+def _unreachable(begin_word: str, end_word: str, word_set) -> bool:
+    
+    # Component check for sources that keep one (WordGraph); raw word lists
+    # would need a full scan to build it, so they just search
+    connected = getattr(word_set, "connected", None)
+    return connected is not None and not connected(begin_word, end_word)
+
+
+def word_ladder_length(begin_word: str, end_word: str, word_list) -> int:
+    word_set, neighbors = _neighbor_source(word_list)
     
     # If end_word is not in the dictionary, no solution exists
-    if end_word not in word_set:
+    if end_word not in word_set or _unreachable(begin_word, end_word, word_set):
         return 0
     
     # BFS
@@ -19,105 +133,31 @@ def word_ladder_length(begin_word: str, end_word: str, word_list: List[str]) ->
         if current_word == end_word:
             return path_length
         
-        # Try changing each character
-        for i in range(len(current_word)):
-            for c in 'abcdefghijklmnopqrstuvwxyz':
-                if c == current_word[i]:
-                    continue
-                
-                # Create new word with one character changed
-                new_word = current_word[:i] + c + current_word[i+1:]
-                
-                if new_word in word_set and new_word not in visited:
-                    visited.add(new_word)
-                    queue.append((new_word, path_length + 1))
+        # Every dictionary word one letter away
+        for new_word in neighbors(current_word):
+            if new_word not in visited:
+                visited.add(new_word)
+                queue.append((new_word, path_length + 1))
     
     return 0  # No path found
 
 
-def word_ladder_path(begin_word: str, end_word: str, word_list: List[str]) -> List[str]:
-    word_set = set(word_list)
-    
-    if end_word not in word_set:
-        return []
-    
-    # BFS with path tracking
-    queue = deque([(begin_word, [begin_word])])  # (current_word, path)
-    visited = {begin_word}
+def word_ladder_path(begin_word: str, end_word: str, word_list) -> List[str]:
     
-    while queue:
-        current_word, path = queue.popleft()
-        
-        if current_word == end_word:
-            return path
-        
-        # Try changing each character
-        for i in range(len(current_word)):
-            for c in 'abcdefghijklmnopqrstuvwxyz':
-                if c == current_word[i]:
-                    continue
-                
-                new_word = current_word[:i] + c + current_word[i+1:]
-                
-                if new_word in word_set and new_word not in visited:
-                    visited.add(new_word)
-                    queue.append((new_word, path + [new_word]))
-    
-    return []
+    # Parent links instead of per-node path copies, see _bidirectional_search
+    return bidirectional_word_ladder_path(begin_word, end_word, word_list)
 
 
-def word_ladder_all_paths(begin_word: str, end_word: str, word_list: List[str]) -> List[List[str]]:
-    
-    word_set = set(word_list)
+def word_ladder_all_paths(begin_word: str, end_word: str, word_list) -> List[List[str]]:
     
-    if end_word not in word_set:
-        return []
-    
-    # BFS to find shortest path length first
-    all_paths = []
-    shortest_length = float('inf')
-    
-    # (current_word, path)
-    queue = deque([(begin_word, [begin_word])])
-    
-    # Track visited words at each level to allow multiple paths
-    level_visited = {begin_word: 0}  # word -> level at which it was first visited
-    
-    while queue:
-        current_word, path = queue.popleft()
-        current_level = len(path)
-        
-        # If we've exceeded the shortest path, stop
-        if current_level > shortest_length:
-            break
-        
-        if current_word == end_word:
-            shortest_length = current_level
-            all_paths.append(path)
-            continue
-        
-        # Try changing each character
-        for i in range(len(current_word)):
-            for c in 'abcdefghijklmnopqrstuvwxyz':
-                if c == current_word[i]:
-                    continue
-                
-                new_word = current_word[:i] + c + current_word[i+1:]
-                
-                if new_word in word_set:
-                    # Allow revisiting if at the same level (for multiple paths)
-                    if new_word not in level_visited or level_visited[new_word] >= current_level:
-                        level_visited[new_word] = current_level + 1
-                        queue.append((new_word, path + [new_word]))
-    
-    return all_paths
+    return bidirectional_word_ladder_all_paths(begin_word, end_word, word_list)
 
 
-def get_neighbors(word: str, word_set: Set[str]) -> List[str]:
+def get_neighbors(word: str, word_set: Set[str], alphabet: str = 'abcdefghijklmnopqrstuvwxyz') -> List[str]:
    
     neighbors = []
     for i in range(len(word)):
-        for c in 'abcdefghijklmnopqrstuvwxyz':
+        for c in alphabet:
             if c != word[i]:
                 new_word = word[:i] + c + word[i+1:]
                 if new_word in word_set:
@@ -125,12 +165,16 @@ def get_neighbors(word: str, word_set: Set[str]) -> List[str]:
     return neighbors
 
 
-def bidirectional_word_ladder(begin_word: str, end_word: str, word_list: List[str]) -> int:
+def bidirectional_word_ladder(begin_word: str, end_word: str, word_list) -> int:
     
-    word_set = set(word_list)
+    word_set, neighbors = _neighbor_source(word_list)
     
     if end_word not in word_set:
         return 0
+    if begin_word == end_word:
+        return 1
+    if _unreachable(begin_word, end_word, word_set):
+        return 0
     
     # Two sets for bidirectional search
     front = {begin_word}
@@ -147,16 +191,13 @@ def bidirectional_word_ladder(begin_word: str, end_word: str, word_list: List[st
         next_front = set()
         
         for word in front:
-            for i in range(len(word)):
-                for c in 'abcdefghijklmnopqrstuvwxyz':
-                    new_word = word[:i] + c + word[i+1:]
-                    
-                    if new_word in back:
-                        return length + 1
-                    
-                    if new_word in word_set and new_word not in visited:
-                        visited.add(new_word)
-                        next_front.add(new_word)
+            for new_word in neighbors(word):
+                if new_word in back:
+                    return length + 1
+                
+                if new_word not in visited:
+                    visited.add(new_word)
+                    next_front.add(new_word)
         
         front = next_front
         length += 1
@@ -164,6 +205,548 @@ def bidirectional_word_ladder(begin_word: str, end_word: str, word_list: List[st
     return 0
 
 
+def _bidirectional_search(begin_word: str, end_word: str, word_list,
+                          all_parents: bool) -> Tuple[List[str], Tuple[Dict[str, List[str]], Dict[str, List[str]]]]:
+    
+    # Layer-by-layer search from both ends, always expanding the smaller
+    # frontier. Each side records, per visited word, its parents in the
+    # previous layer (only the first one unless all_parents), so memory is
+    # proportional to the words visited. Returns the meeting words on the
+    # first layer where the searches touch plus both parent maps; every
+    # shortest path crosses exactly one meeting word.
+    word_set, neighbors = _neighbor_source(word_list)
+    parents: Tuple[Dict[str, List[str]], Dict[str, List[str]]] = ({begin_word: []}, {end_word: []})
+    
+    if end_word not in word_set:
+        return [], parents
+    if begin_word == end_word:
+        return [begin_word], parents
+    if _unreachable(begin_word, end_word, word_set):
+        return [], parents
+    
+    depths = ({begin_word: 0}, {end_word: 0})
+    fronts = [[begin_word], [end_word]]
+    
+    while fronts[0] and fronts[1]:
+        side = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+        own_depth, other_depth, own_parents = depths[side], depths[1 - side], parents[side]
+        depth = own_depth[fronts[side][0]] + 1
+        
+        next_front = []
+        for word in fronts[side]:
+            for new_word in neighbors(word):
+                seen = own_depth.get(new_word)
+                if seen is None:
+                    own_depth[new_word] = depth
+                    own_parents[new_word] = [word]
+                    next_front.append(new_word)
+                elif seen == depth and all_parents:
+                    own_parents[new_word].append(word)
+        fronts[side] = next_front
+        
+        meet = [word for word in next_front if word in other_depth]
+        if meet:
+            # Keep only the words on shortest paths
+            best = min(other_depth[word] for word in meet)
+            return [word for word in meet if other_depth[word] == best], parents
+    
+    return [], parents
+
+
+def _paths_from_root(word: str, parents: Dict[str, List[str]]) -> Iterator[List[str]]:
+    
+    # Every path from the search root to word, rebuilt from parent links
+    if not parents[word]:
+        yield [word]
+        return
+    for parent in parents[word]:
+        for path in _paths_from_root(parent, parents):
+            path.append(word)
+            yield path
+
+
+def bidirectional_word_ladder_path(begin_word: str, end_word: str, word_list) -> List[str]:
+    
+    meet, (begin_parents, end_parents) = _bidirectional_search(begin_word, end_word, word_list, False)
+    if not meet:
+        return []
+    
+    word = meet[0]
+    head = next(_paths_from_root(word, begin_parents))
+    tail = next(_paths_from_root(word, end_parents))
+    return head + tail[-2::-1]
+
+
+def bidirectional_word_ladder_all_paths(begin_word: str, end_word: str, word_list) -> List[List[str]]:
+    
+    meet, (begin_parents, end_parents) = _bidirectional_search(begin_word, end_word, word_list, True)
+    
+    all_paths = []
+    for word in meet:
+        tails = [tail[-2::-1] for tail in _paths_from_root(word, end_parents)]
+        for head in _paths_from_root(word, begin_parents):
+            for tail in tails:
+                all_paths.append(head + tail)
+    
+    all_paths.sort()
+    return all_paths
+
+
+class LadderQueryCache:
+    
+    # Query layer for many ladders sharing a begin_word. The first query from
+    # a source runs one full BFS and keeps its parent tree; later queries from
+    # that source walk the tree from the target in O(path length). Trees are
+    # evicted least-recently-used once their estimated size exceeds max_bytes
+    # (the most recent tree is always kept). A shared WordGraph may keep
+    # growing through add(); dictionaries never shrink, so a change in size
+    # means the cached trees are stale and they are all dropped.
+    
+    def __init__(self, word_list, max_bytes: int = 64 * 1024 * 1024):
+        graph = word_list if hasattr(word_list, "neighbors") else WordGraph(word_list)
+        self.words, self.neighbors = _neighbor_source(graph)
+        self.max_bytes = max_bytes
+        self.trees: "OrderedDict[str, Tuple[Dict[str, Optional[str]], int]]" = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._size = len(self.words)
+    
+    def _tree(self, source: str) -> Dict[str, Optional[str]]:
+        if len(self.words) != self._size:
+            self._size = len(self.words)
+            self.trees.clear()
+            self.used_bytes = 0
+            self.invalidations += 1
+        
+        entry = self.trees.get(source)
+        if entry is not None:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            return entry[0]
+        
+        self.misses += 1
+        
+        # BFS from source; parent[word] is the previous word on a shortest path
+        parent: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        neighbors = self.neighbors
+        while queue:
+            word = queue.popleft()
+            for new_word in neighbors(word):
+                if new_word not in parent:
+                    parent[new_word] = word
+                    queue.append(new_word)
+        
+        # Words are shared with the dictionary, so the dict itself dominates
+        size = sys.getsizeof(parent)
+        self.trees[source] = (parent, size)
+        self.used_bytes += size
+        
+        while self.used_bytes > self.max_bytes and len(self.trees) > 1:
+            _, (_, evicted_size) = self.trees.popitem(last=False)
+            self.used_bytes -= evicted_size
+            self.evictions += 1
+        
+        return parent
+    
+    def path(self, begin_word: str, end_word: str) -> List[str]:
+        if end_word not in self.words:
+            return []
+        
+        parent = self._tree(begin_word)
+        if end_word not in parent:
+            return []
+        
+        path = []
+        word: Optional[str] = end_word
+        while word is not None:
+            path.append(word)
+            word = parent[word]
+        path.reverse()
+        return path
+    
+    def length(self, begin_word: str, end_word: str) -> int:
+        return len(self.path(begin_word, end_word))
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "cached_sources": len(self.trees),
+            "used_bytes": self.used_bytes,
+        }
+
+
+# On-disk dictionary format (native byte order, recorded in the header):
+#   header   "WLADDER1", byte order, group count
+#   per word length L, a group entry followed later by its sections:
+#     words     count fixed-width records (L chars, 1 byte each if the group is
+#               ASCII, otherwise UTF-32-LE), sorted for binary search
+#     index     count + 1 uint32 offsets into adjacency (CSR)
+#     adjacency uint32 ids of one-letter neighbours within the group
+#     alphabet  UTF-8 characters used by the group (for out-of-store words)
+_STORE_MAGIC = b"WLADDER1"
+_STORE_HEADER = struct.Struct("<8s1sxxxI")
+_STORE_GROUP = struct.Struct("<IIIIQQQQ")
+
+
+def build_word_store(word_list: Iterable[str], path: str) -> int:
+    
+    # Writes word_list as a prebuilt store; returns the number of words
+    by_length: Dict[int, Set[str]] = defaultdict(set)
+    for word in word_list:
+        by_length[len(word)].add(word)
+    
+    groups = []
+    for length in sorted(by_length):
+        words = by_length[length]
+        ascii_only = all(word.isascii() for word in words)
+        codec, width = ("ascii", 1) if ascii_only else ("utf-32-le", 4)
+        
+        records = sorted(word.encode(codec) for word in words)
+        decoded = [record.decode(codec) for record in records]
+        
+        # Adjacency via wildcard buckets, only needed while building
+        buckets: Dict[str, List[int]] = defaultdict(list)
+        for word_id, word in enumerate(decoded):
+            for pattern in WordGraph.patterns(word):
+                buckets[pattern].append(word_id)
+        
+        index = array("I", [0])
+        adjacency = array("I")
+        for word_id, word in enumerate(decoded):
+            for pattern in WordGraph.patterns(word):
+                adjacency.extend(other for other in buckets[pattern] if other != word_id)
+            index.append(len(adjacency))
+        
+        alphabet = "".join(sorted({ch for word in decoded for ch in word})).encode("utf-8")
+        groups.append((length, width, b"".join(records), index, adjacency, alphabet))
+    
+    # Lay out the sections after the header and group table, 8-byte aligned
+    offset = _STORE_HEADER.size + _STORE_GROUP.size * len(groups)
+    entries = []
+    for length, width, records, index, adjacency, alphabet in groups:
+        sections = []
+        for blob_size in (len(records), index.itemsize * len(index),
+                          adjacency.itemsize * len(adjacency), len(alphabet)):
+            offset = (offset + 7) & ~7
+            sections.append(offset)
+            offset += blob_size
+        count = len(records) // (length * width) if length else len(index) - 1
+        entries.append((length, count, width, len(alphabet), *sections))
+    
+    with open(path, "wb") as f:
+        f.write(_STORE_HEADER.pack(_STORE_MAGIC, b"<" if sys.byteorder == "little" else b">", len(groups)))
+        for entry in entries:
+            f.write(_STORE_GROUP.pack(*entry))
+        for entry, (_, _, records, index, adjacency, alphabet) in zip(entries, groups):
+            for section, blob in zip(entry[4:], (records, index.tobytes(), adjacency.tobytes(), alphabet)):
+                f.write(b"\0" * (section - f.tell()))
+                f.write(blob)
+    
+    return sum(entry[1] for entry in entries)
+
+
+class WordStore:
+    
+    # Read-only, memory-mapped view of a file written by build_word_store.
+    # Opening only parses the group table; words and adjacency are read
+    # straight from the mapping, so processes opening the same file share its
+    # pages. Provides neighbors() and "in", so it can be passed to the ladder
+    # functions anywhere a word list or WordGraph is accepted.
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, byteorder, group_count = _STORE_HEADER.unpack_from(self._mm, 0)
+        if magic != _STORE_MAGIC:
+            raise ValueError(f"{path} is not a word store")
+        if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+            raise ValueError(f"{path} was built on a machine with the other byte order")
+        
+        self._view = memoryview(self._mm)
+        self._groups: Dict[int, tuple] = {}
+        for g in range(group_count):
+            (length, count, width, alphabet_size, words_offset, index_offset,
+             adjacency_offset, alphabet_offset) = _STORE_GROUP.unpack_from(
+                self._mm, _STORE_HEADER.size + g * _STORE_GROUP.size)
+            
+            index = self._view[index_offset:index_offset + 4 * (count + 1)].cast("I")
+            adjacency = self._view[adjacency_offset:adjacency_offset + 4 * index[count]].cast("I")
+            alphabet = self._mm[alphabet_offset:alphabet_offset + alphabet_size].decode("utf-8")
+            codec = "ascii" if width == 1 else "utf-32-le"
+            self._groups[length] = (count, length * width, codec, words_offset, index, adjacency, alphabet)
+        
+        self._size = sum(group[0] for group in self._groups.values())
+    
+    def _find(self, word: str) -> Tuple[Optional[tuple], int]:
+        # (group, id) of word, id -1 if absent
+        group = self._groups.get(len(word))
+        if group is None:
+            return None, -1
+        count, record, codec, base, _, _, _ = group
+        try:
+            key = word.encode(codec)
+        except UnicodeEncodeError:
+            return group, -1
+        
+        mm = self._mm
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + mid * record
+            if mm[start:start + record] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        
+        if lo < count and mm[base + lo * record:base + (lo + 1) * record] == key:
+            return group, lo
+        return group, -1
+    
+    def _word(self, group: tuple, word_id: int) -> str:
+        _, record, codec, base, _, _, _ = group
+        start = base + word_id * record
+        return self._mm[start:start + record].decode(codec)
+    
+    def neighbors(self, word: str) -> List[str]:
+        group, word_id = self._find(word)
+        if group is None:
+            return []
+        
+        if word_id >= 0:
+            # Precomputed adjacency
+            index, adjacency = group[4], group[5]
+            return [self._word(group, other) for other in adjacency[index[word_id]:index[word_id + 1]]]
+        
+        # Words outside the store (e.g. a begin_word): probe candidates drawn
+        # from the group's alphabet
+        result = []
+        for i in range(len(word)):
+            for c in group[6]:
+                if c != word[i]:
+                    new_word = word[:i] + c + word[i + 1:]
+                    if self._find(new_word)[1] >= 0:
+                        result.append(new_word)
+        return result
+    
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._find(word)[1] >= 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[str]:
+        for group in self._groups.values():
+            for word_id in range(group[0]):
+                yield self._word(group, word_id)
+    
+    def close(self) -> None:
+        # Exported views must be released before the mapping can close
+        for group in self._groups.values():
+            group[4].release()
+            group[5].release()
+        self._groups = {}
+        self._view.release()
+        self._mm.close()
+    
+    def __enter__(self) -> "WordStore":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PackedWordSet:
+    
+    # Words of equal length packed into uint64 keys, `bits` per character
+    # (codes are positions in the alphabet), kept as one sorted array per
+    # length. A BFS level is expanded for the whole frontier at once: clear a
+    # character with a mask, OR in every letter, and resolve the candidates
+    # with searchsorted, so no intermediate strings are built. Lengths whose
+    # keys would not fit in 64 bits fall back to a WordGraph. Dictionary words
+    # with characters outside the alphabet are ignored. NumPy is imported on
+    # construction only.
+    
+    MAX_CANDIDATES = 1 << 20
+    
+    def __init__(self, word_list: Iterable[str], alphabet: Optional[str] = None):
+        import numpy as np
+        self._np = np
+        
+        words = set(word_list)
+        if alphabet is None:
+            alphabet = "".join(sorted({ch for word in words for ch in word}))
+        self.alphabet = alphabet
+        self.bits = max(1, (len(alphabet) - 1).bit_length())
+        self._code = {ch: i for i, ch in enumerate(alphabet)}
+        self._letters = np.arange(len(alphabet), dtype=np.uint64)
+        
+        by_length: Dict[int, List[str]] = defaultdict(list)
+        for word in words:
+            if all(ch in self._code for ch in word):
+                by_length[len(word)].append(word)
+        
+        self._keys = {}
+        self._graphs: Dict[int, WordGraph] = {}
+        for length, group in by_length.items():
+            if length * self.bits <= 64:
+                self._keys[length] = np.sort(np.array([self.encode(word) for word in group], dtype=np.uint64))
+            else:
+                self._graphs[length] = WordGraph(group)
+    
+    def encode(self, word: str) -> int:
+        # KeyError for characters outside the alphabet
+        key = 0
+        for i, ch in enumerate(word):
+            key |= self._code[ch] << (self.bits * i)
+        return key
+    
+    def decode(self, key: int, length: int) -> str:
+        mask = (1 << self.bits) - 1
+        return "".join(self.alphabet[(key >> (self.bits * i)) & mask] for i in range(length))
+    
+    def _lookup(self, keys, length: int):
+        # Indices into the sorted key array of those keys that are words
+        np = self._np
+        table = self._keys[length]
+        idx = np.searchsorted(table, keys)
+        idx[idx == len(table)] = 0
+        return idx[table[idx] == keys]
+    
+    def _expand(self, frontier, length: int):
+        # Unique indices of every word one letter away from a frontier word
+        np = self._np
+        table = self._keys[length]
+        mask = (1 << self.bits) - 1
+        step = max(1, self.MAX_CANDIDATES // max(1, length * len(self.alphabet)))
+        
+        found = []
+        for start in range(0, len(frontier), step):
+            keys = table[frontier[start:start + step]]
+            for i in range(length):
+                shift = np.uint64(self.bits * i)
+                cleared = keys & np.uint64(~(mask << (self.bits * i)) & 0xFFFFFFFFFFFFFFFF)
+                candidates = (cleared[:, None] | (self._letters << shift)[None, :]).ravel()
+                found.append(self._lookup(candidates, length))
+        
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(found))
+    
+    def _neighbor_ids(self, word: str):
+        np = self._np
+        try:
+            key = self.encode(word)
+        except KeyError:
+            # Only the foreign character can change, so probe it directly
+            keys = []
+            for i, ch in enumerate(word):
+                if ch not in self._code:
+                    for c in self.alphabet:
+                        try:
+                            keys.append(self.encode(word[:i] + c + word[i + 1:]))
+                        except KeyError:
+                            break
+                    break
+            return np.unique(self._lookup(np.array(keys, dtype=np.uint64), len(word)))
+        
+        # Expanding the key directly also covers out-of-dictionary words
+        ids = []
+        for i in range(len(word)):
+            shift = self.bits * i
+            cleared = key & ~(((1 << self.bits) - 1) << shift)
+            ids.append(self._lookup(np.uint64(cleared) | (self._letters << np.uint64(shift)), len(word)))
+        ids = np.unique(np.concatenate(ids))
+        return ids[self._keys[len(word)][ids] != np.uint64(key)]
+    
+    def neighbors(self, word: str) -> List[str]:
+        length = len(word)
+        if length in self._graphs:
+            return self._graphs[length].neighbors(word)
+        if length not in self._keys:
+            return []
+        table = self._keys[length]
+        return [self.decode(int(table[i]), length) for i in self._neighbor_ids(word)]
+    
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        if len(word) in self._graphs:
+            return word in self._graphs[len(word)]
+        if len(word) not in self._keys:
+            return False
+        try:
+            key = self.encode(word)
+        except KeyError:
+            return False
+        return len(self._lookup(self._np.array([key], dtype=self._np.uint64), len(word))) > 0
+    
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys.values()) + sum(len(g) for g in self._graphs.values())
+    
+    def ladder_length(self, begin_word: str, end_word: str) -> int:
+        if end_word not in self:
+            return 0
+        if begin_word == end_word:
+            return 1
+        length = len(begin_word)
+        if length != len(end_word):
+            return 0
+        if length in self._graphs:
+            return bidirectional_word_ladder(begin_word, end_word, self._graphs[length])
+        
+        # Bidirectional, level by level, expanding the smaller frontier.
+        # dist[side][i] is the number of edges from that side's root, -1 if
+        # unseen; begin_word itself may lie outside the dictionary, so its
+        # side starts from its neighbours at distance 1.
+        np = self._np
+        table = self._keys[length]
+        dist = (np.full(len(table), -1, dtype=np.int32), np.full(len(table), -1, dtype=np.int32))
+        end_id = int(self._lookup(np.array([self.encode(end_word)], dtype=np.uint64), length)[0])
+        
+        start = self._neighbor_ids(begin_word)
+        if begin_word in self:
+            dist[0][self._lookup(np.array([self.encode(begin_word)], dtype=np.uint64), length)] = 0
+        if dist[0][end_id] == 0:
+            return 1
+        dist[0][start] = 1
+        if dist[0][end_id] == 1:
+            return 2
+        dist[1][end_id] = 0
+        
+        frontiers = [start, np.array([end_id], dtype=np.intp)]
+        depth = [1, 0]
+        while len(frontiers[0]) and len(frontiers[1]):
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            new = self._expand(frontiers[side], length)
+            new = new[dist[side][new] < 0]
+            depth[side] += 1
+            dist[side][new] = depth[side]
+            
+            met = dist[1 - side][new]
+            met = met[met >= 0]
+            if len(met):
+                return depth[side] + int(met.min()) + 1
+            frontiers[side] = new
+        
+        return 0
+
+
+def word_ladder_length_packed(begin_word: str, end_word: str, word_list, alphabet: Optional[str] = None) -> int:
+    
+    # Reuse a prebuilt PackedWordSet when given one
+    if not isinstance(word_list, PackedWordSet):
+        word_list = PackedWordSet(word_list, alphabet)
+    return word_list.ladder_length(begin_word, end_word)
+
+
 # Test the solutions
 if __name__ == "__main__":
     # Example from the problem
@@ -178,18 +761,41 @@ if __name__ == "__main__":
     print(f"Word list: {word_list}")
     print()
     
+    # Build the neighbour index once and reuse it for every query
+    graph = WordGraph(word_list)
+    
+    # Component index rules out impossible queries without a search
+    print(f"Connected: {graph.connected(begin_word, end_word)}, "
+          f"hit -> xyz connected: {graph.connected(begin_word, 'xyz')}")
+    
     # Find shortest path length
-    length = word_ladder_length(begin_word, end_word, word_list)
+    length = word_ladder_length(begin_word, end_word, graph)
     print(f"Shortest transformation length: {length}")
     
     # Find the actual path
-    path = word_ladder_path(begin_word, end_word, word_list)
+    path = word_ladder_path(begin_word, end_word, graph)
     print(f"Transformation path: {' -> '.join(path)}")
     
     # Find all shortest paths
-    all_paths = word_ladder_all_paths(begin_word, end_word, word_list)
+    all_paths = word_ladder_all_paths(begin_word, end_word, graph)
     print(f"\nAll shortest paths ({len(all_paths)} found):")
     for i, p in enumerate(all_paths, 1):
         print(f"  Path {i}: {' -> '.join(p)}")
     
-   
\ No newline at end of file
+    # Prebuilt store: build once, then memory-map it for queries
+    import os
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as store_dir:
+        store_path = os.path.join(store_dir, "words.bin")
+        build_word_store(word_list, store_path)
+        with WordStore(store_path) as store:
+            print(f"\nMapped store ({len(store)} words): "
+                  f"{' -> '.join(word_ladder_path(begin_word, end_word, store))}")
+    
+    # Vectorized frontier expansion over packed words (needs NumPy)
+    try:
+        packed = PackedWordSet(word_list)
+        print(f"Packed ladder length: {word_ladder_length_packed(begin_word, end_word, packed)}")
+    except ImportError:
+        pass
@@ -1,5 +1,6 @@
 
-from typing import List
+from typing import Iterable, List, Sequence
+from bisect import bisect_left, bisect_right
 
 
 def find_median_sorted_arrays(nums1: List[int], nums2: List[int]) -> float:
@@ -72,36 +73,82 @@ def find_median_simple(nums1: List[int], nums2: List[int]) -> float:
 
 
 def find_median_kth_element(nums1: List[int], nums2: List[int]) -> float:
-   
-    def find_kth(arr1: List[int], arr2: List[int], k: int) -> int:
-        
-        if not arr1:
-            return arr2[k]
-        if not arr2:
-            return arr1[k]
-        
-        mid1, mid2 = len(arr1) // 2, len(arr2) // 2
-        
-        if mid1 + mid2 < k:
-            # k is in the larger half
-            if arr1[mid1] > arr2[mid2]:
-                return find_kth(arr1, arr2[mid2 + 1:], k - mid2 - 1)
-            else:
-                return find_kth(arr1[mid1 + 1:], arr2, k - mid1 - 1)
-        else:
-            # k is in the smaller half
-            if arr1[mid1] > arr2[mid2]:
-                return find_kth(arr1[:mid1], arr2, k)
-            else:
-                return find_kth(arr1, arr2[:mid2], k)
     
     total = len(nums1) + len(nums2)
     
     if total % 2 == 1:
-        return find_kth(nums1, nums2, total // 2)
+        return kth_of_sorted([nums1, nums2], total // 2)
     else:
-        return (find_kth(nums1, nums2, total // 2 - 1) + 
-                find_kth(nums1, nums2, total // 2)) / 2
+        return (kth_of_sorted([nums1, nums2], total // 2 - 1) +
+                kth_of_sorted([nums1, nums2], total // 2)) / 2
+
+
+def kth_of_sorted(arrays: Sequence[Sequence[float]], k: int) -> float:
+    
+    # k-th smallest (0-based, negative counts from the end) of the union of K
+    # sorted sequences, without copying or merging them. Each array keeps a
+    # live window [lo, hi). Every round takes the weighted median of the
+    # window midpoints as pivot and counts, by bisect inside the windows,
+    # how many remaining elements are < and <= it. Then either the pivot is
+    # the answer, or everything on the wrong side of it is dropped. At least
+    # a quarter of the remaining elements go each round, so a round costs
+    # O(K log K + K log n) and there are O(log N) rounds.
+    total = sum(len(arr) for arr in arrays)
+    if k < 0:
+        k += total
+    if not 0 <= k < total:
+        raise IndexError(f"k out of range for {total} elements")
+    
+    lo = [0] * len(arrays)
+    hi = [len(arr) for arr in arrays]
+    
+    while True:
+        # Weighted median of the window midpoints
+        mids = sorted((arrays[i][(lo[i] + hi[i]) // 2], hi[i] - lo[i])
+                      for i in range(len(arrays)) if lo[i] < hi[i])
+        weight = 0
+        for pivot, size in mids:
+            weight += size
+            if 2 * weight >= total:
+                break
+        
+        below = [bisect_left(arr, pivot, lo[i], hi[i]) for i, arr in enumerate(arrays)]
+        less = sum(below[i] - lo[i] for i in range(len(arrays)))
+        if k < less:
+            hi = below
+            total = less
+            continue
+        
+        upto = [bisect_right(arr, pivot, lo[i], hi[i]) for i, arr in enumerate(arrays)]
+        less_equal = sum(upto[i] - lo[i] for i in range(len(arrays)))
+        if k < less_equal:
+            return pivot
+        k -= less_equal
+        total -= less_equal
+        lo = upto
+
+
+def quantiles(arrays: Sequence[Sequence[float]], qs: Iterable[float]) -> List[float]:
+    
+    # Quantiles (fractions in [0, 1]) of the union of K sorted sequences,
+    # interpolating linearly between order statistics like NumPy's default
+    # method; e.g. quantiles(shards, [0.5, 0.95, 0.99]) for p50/p95/p99
+    total = sum(len(arr) for arr in arrays)
+    if total == 0:
+        raise ValueError("quantiles of no data")
+    
+    result = []
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile {q} outside [0, 1]")
+        position = q * (total - 1)
+        index = int(position)
+        fraction = position - index
+        value = kth_of_sorted(arrays, index)
+        if fraction:
+            value += (kth_of_sorted(arrays, index + 1) - value) * fraction
+        result.append(value)
+    return result
 
 
 # Test the solutions
@@ -123,4 +170,8 @@ if __name__ == "__main__":
     print(f"Median (Simple merge): {median_simple}")
     print(f"Results match: {median_bs == median_simple}")
     
-    
\ No newline at end of file
+    # Order statistics over several sorted shards
+    shards = [[1, 4, 9, 16], [2, 3, 5, 7, 11, 13], [], [6, 8, 10]]
+    print(f"\nShards: {shards}")
+    print(f"5th smallest: {kth_of_sorted(shards, 4)}")
+    print(f"p50/p95/p99: {quantiles(shards, [0.5, 0.95, 0.99])}")
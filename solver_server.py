@@ -0,0 +1,578 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import q2_sudoku_solver
+import q3_n_queens
+import q4_word_ladder
+import q6_graph_cycle_detection
+
+
+# JSON-lines protocol, one object per line in each direction:
+#   request   {"id": 1, "method": "word_ladder_length", "params": {...}}
+#   response  {"id": 1, "result": ...} or {"id": 1, "error": "..."}
+# Responses may arrive out of order; match them by id. "stats" returns the
+# server counters and per-endpoint latency histograms.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+LINE_LIMIT = 1 << 24          # Longest request line accepted
+BATCH_MAX_BYTES = 4096        # Larger requests are dispatched on their own
+HEAVY_QUEENS = 11             # N-Queens counts from this n are dispatched on their own
+MAX_QUEENS = 14               # Largest n served (n = 14 takes seconds; each step up ~6x)
+
+
+class RequestError(Exception):
+    pass
+
+
+# Endpoints, run inside the worker processes
+
+@lru_cache(maxsize=8)
+def _word_graph(words: Tuple[str, ...]) -> q4_word_ladder.WordGraph:
+    
+    # Clients tend to reuse one dictionary, so keep its graph per worker
+    return q4_word_ladder.WordGraph(words)
+
+
+def _word_ladder_length(params: Dict[str, Any]) -> int:
+    graph = _word_graph(tuple(params["word_list"]))
+    return q4_word_ladder.word_ladder_length(params["begin_word"], params["end_word"], graph)
+
+
+def _solve_sudoku(params: Dict[str, Any]) -> Optional[List[List[int]]]:
+    
+    # Board as 9 lists of 9 ints or an 81-character string; null if unsolvable
+    board = params["board"]
+    if isinstance(board, str):
+        board = q2_sudoku_solver.parse_puzzle(board)
+    return board if q2_sudoku_solver.solve_sudoku(board) else None
+
+
+def _count_solutions(params: Dict[str, Any]) -> int:
+    n = params["n"]
+    if not isinstance(n, int) or not 0 <= n <= MAX_QUEENS:
+        raise ValueError(f"n must be an integer in 0..{MAX_QUEENS}")
+    blocked = params.get("blocked")
+    return q3_n_queens.count_solutions(params["n"], partial=params.get("partial"),
+                                       blocked=[tuple(cell) for cell in blocked] if blocked else None)
+
+
+def _node(key: str):
+    
+    # JSON object keys are always strings; integer labels are restored
+    try:
+        return int(key)
+    except ValueError:
+        return key
+
+
+def _has_cycle(params: Dict[str, Any]) -> bool:
+    
+    # Iterative DFS, so deep graphs do not hit the recursion limit
+    graph = {_node(node): neighbors for node, neighbors in params["graph"].items()}
+    return q6_graph_cycle_detection.has_cycle_iterative(graph)
+
+
+ENDPOINTS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "word_ladder_length": _word_ladder_length,
+    "solve_sudoku": _solve_sudoku,
+    "count_solutions": _count_solutions,
+    "has_cycle": _has_cycle,
+}
+
+
+def _run_batch(batch: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+    
+    # One pool task per micro-batch; a failing request only fails itself
+    results = []
+    for method, params in batch:
+        try:
+            results.append((True, ENDPOINTS[method](params)))
+        except Exception as exc:
+            results.append((False, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def _is_heavy(method: str, params: Dict[str, Any]) -> bool:
+    return method == "count_solutions" and isinstance(params.get("n"), int) and params["n"] >= HEAVY_QUEENS
+
+
+class LatencyHistogram:
+    
+    # Fixed log-spaced buckets, four per doubling from 10us to ~10s, so
+    # recording is O(log buckets) and memory does not grow with traffic.
+    # Percentiles report the upper bound of the bucket they fall in.
+    
+    BOUNDS = [1e-5 * 2 ** (i / 4) for i in range(81)]
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        target = max(1, -(-self.total * q // 100))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.BOUNDS[i], self.max) if i < len(self.BOUNDS) else self.max
+        return self.max
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "mean_ms": 1000 * self.sum / self.total if self.total else 0.0,
+            "p50_ms": 1000 * self.percentile(50),
+            "p90_ms": 1000 * self.percentile(90),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.max,
+            # Upper bound in ms -> count, non-empty buckets only
+            "buckets": {f"{1000 * bound:.3f}": count
+                        for bound, count in zip(self.BOUNDS + [float("inf")], self.counts) if count},
+        }
+
+
+class SolverServer:
+    
+    # Requests are parsed on the event loop and executed in a process pool.
+    #   coalescing     identical (method, params) requests already in flight
+    #                  share one execution
+    #   micro-batching small requests wait up to batch_delay seconds (or
+    #                  until batch_size are queued) and go to the pool as one
+    #                  task, amortizing the IPC round trip
+    #   backpressure   at most max_in_flight requests are admitted across all
+    #                  connections; beyond that the server stops reading, so
+    #                  socket buffers fill and clients slow down
+    
+    def __init__(self, workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 batch_size: int = 32, batch_delay: float = 0.002):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 64 * self.workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        
+        self.histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.counters = {"requests": 0, "errors": 0, "coalesced": 0, "batches": 0, "pool_restarts": 0}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+    
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        
+        # Listens on the Unix socket at path if given, else on host:port.
+        # Workers start lazily; plain fork would copy whatever connection
+        # sockets are open at that moment into them and keep those
+        # connections alive after we close them, so fork from a clean server.
+        self._pool = self._new_pool()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path, limit=LINE_LIMIT)
+        return await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+    
+    def _new_pool(self) -> ProcessPoolExecutor:
+        context = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+    
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        # A worker died (e.g. OOM-killed); the executor refuses all further
+        # work, so swap in a fresh one unless that already happened
+        if self._pool is broken:
+            self.counters["pool_restarts"] += 1
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+    
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "in_flight": len(self._in_flight),
+            "endpoints": {method: h.snapshot() for method, h in sorted(self.histograms.items())},
+        }
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    line = b""
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Admission before the next read: a full server stops reading
+                # this socket, while idle connections hold no slot
+                await self._slots.acquire()
+                task = asyncio.ensure_future(self._serve_line(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+    
+    async def _serve_line(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        start = time.perf_counter()
+        self.counters["requests"] += 1
+        request_id = None
+        endpoint = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+            request_id = request.get("id")
+            method = request.get("method")
+            params = request.get("params") or {}
+            if not isinstance(method, str):
+                raise RequestError("method must be a string")
+            if not isinstance(params, dict):
+                raise RequestError("params must be a JSON object")
+            if method == "stats":
+                result = self.stats()
+            elif method in ENDPOINTS:
+                endpoint = method
+                result = await self._call(method, params, len(line))
+            else:
+                raise RequestError(f"unknown method {method!r}")
+            response = {"id": request_id, "result": result}
+        except RequestError as exc:
+            self.counters["errors"] += 1
+            response = {"id": request_id, "error": str(exc)}
+        except Exception as exc:
+            self.counters["errors"] += 1
+            response = {"id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+        finally:
+            self._slots.release()
+        
+        if endpoint is not None:
+            self.histograms[endpoint].record(time.perf_counter() - start)
+        
+        data = (json.dumps(response) + "\n").encode()
+        try:
+            async with write_lock:
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+    
+    async def _call(self, method: str, params: Dict[str, Any], size: int) -> Any:
+        key = (method, json.dumps(params, sort_keys=True))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            
+            if size > BATCH_MAX_BYTES or _is_heavy(method, params):
+                self._submit([(method, params, future)])
+            else:
+                self._pending.append((method, params, future))
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+                elif self._flush_handle is None:
+                    self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+        
+        # Shielded so one waiter going away does not cancel the shared result
+        ok, value = await asyncio.shield(future)
+        if not ok:
+            raise RequestError(value)
+        return value
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._submit(batch)
+    
+    def _submit(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        self.counters["batches"] += 1
+        pool = self._pool
+        
+        def fail(exc: BaseException) -> None:
+            # Every future must resolve, or its waiters (and any requests
+            # coalesced onto it) hang holding their admission slots
+            if isinstance(exc, BrokenProcessPool):
+                self._replace_pool(pool)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result((False, f"{type(exc).__name__}: {exc}"))
+        
+        try:
+            work = asyncio.get_running_loop().run_in_executor(
+                pool, _run_batch, [(method, params) for method, params, _ in batch])
+        except Exception as exc:
+            fail(exc)
+            return
+        
+        def deliver(work: asyncio.Future) -> None:
+            if work.cancelled():
+                fail(RuntimeError("cancelled"))
+                return
+            exc = work.exception()
+            if exc is not None:
+                # The worker itself failed (e.g. it was killed)
+                fail(exc)
+                return
+            for (_, _, future), result in zip(batch, work.result()):
+                if not future.done():
+                    future.set_result(result)
+        
+        work.add_done_callback(deliver)
+
+
+class SolverClient:
+    
+    # Pipelined client: any number of concurrent calls share one connection
+    # and are matched to responses by id
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._next_id = 0
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._read_task = asyncio.ensure_future(self._read_loop())
+    
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                      path: Optional[str] = None) -> "SolverClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+    
+    async def call(self, method: str, **params) -> Any:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        
+        data = (json.dumps({"id": request_id, "method": method, "params": params}) + "\n").encode()
+        async with self._write_lock:
+            self._writer.write(data)
+            await self._writer.drain()
+        
+        response = await future
+        if "error" in response:
+            raise RequestError(response["error"])
+        return response["result"]
+    
+    async def _read_loop(self) -> None:
+        try:
+            async for line in self._reader:
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+            self._waiting.clear()
+    
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._read_task
+
+
+def sample_requests(count: int, seed: int = 0) -> List[Tuple[str, Dict[str, Any]]]:
+    
+    # A mixed workload for load tests; draws from small pools, so identical
+    # requests repeat and exercise coalescing
+    rng = random.Random(seed)
+    word_list = ["hot", "dot", "dog", "lot", "log", "cog"]
+    boards = [
+        "530070000600195000098000060800060003400803001700020006060000280000419005000080079",
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    ]
+    requests = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            requests.append(("word_ladder_length", {
+                "begin_word": rng.choice(["hit", "hot", "dot"]),
+                "end_word": rng.choice(["cog", "log", "dog"]),
+                "word_list": word_list,
+            }))
+        elif kind == 1:
+            requests.append(("solve_sudoku", {"board": rng.choice(boards)}))
+        elif kind == 2:
+            requests.append(("count_solutions", {"n": rng.randint(4, 9)}))
+        else:
+            nodes = rng.randint(2, 8)
+            graph = {str(u): [v for v in range(nodes) if v > u and rng.random() < 0.4] for u in range(nodes)}
+            if rng.random() < 0.5:
+                graph[str(nodes - 1)] = [0]
+            requests.append(("has_cycle", {"graph": graph}))
+    return requests
+
+
+async def load_test(requests: List[Tuple[str, Dict[str, Any]]], concurrency: int = 64,
+                    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> Dict[str, Any]:
+    
+    # Replays requests with at most `concurrency` outstanding on one
+    # connection; returns client-side throughput and latency plus the
+    # server's own stats
+    client = await SolverClient.connect(host, port, path)
+    limit = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    
+    async def one(method: str, params: Dict[str, Any]) -> None:
+        nonlocal errors
+        async with limit:
+            start = time.perf_counter()
+            try:
+                await client.call(method, **params)
+            except RequestError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one(method, params) for method, params in requests))
+    seconds = time.perf_counter() - start
+    server = await client.call("stats")
+    await client.close()
+    
+    latencies.sort()
+    
+    def percentile(q: float) -> float:
+        return 1000 * latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))] if latencies else 0.0
+    
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "seconds": seconds,
+        "requests_per_sec": len(requests) / seconds if seconds > 0 else 0.0,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "server": server,
+    }
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = SolverServer(args.workers, args.max_in_flight, args.batch_size, args.batch_delay_ms / 1000)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {', '.join(ENDPOINTS)} on {where} with {server.workers} workers", file=sys.stderr)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    
+    parser = argparse.ArgumentParser(description="JSON-lines solver server and load-test client")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the server")
+    bench = commands.add_parser("bench", help="load-test a running server")
+    for sub in (serve, bench):
+        sub.add_argument("--host", default=DEFAULT_HOST)
+        sub.add_argument("--port", type=int, default=DEFAULT_PORT)
+        sub.add_argument("--unix", default=None, help="Unix socket path (instead of TCP)")
+    serve.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    serve.add_argument("--max-in-flight", type=int, default=None, help="admitted requests (default: 64 x workers)")
+    serve.add_argument("--batch-size", type=int, default=32, help="requests per micro-batch")
+    serve.add_argument("--batch-delay-ms", type=float, default=2.0, help="longest wait to fill a micro-batch")
+    bench.add_argument("-n", "--requests", type=int, default=1000)
+    bench.add_argument("-c", "--concurrency", type=int, default=64)
+    bench.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    report = asyncio.run(load_test(sample_requests(args.requests, args.seed), args.concurrency,
+                                   args.host, args.port, args.unix))
+    print(json.dumps(report, indent=2))
+
+
+# Test the solution
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python solver_server.py serve --port 8765
+        # python solver_server.py bench --port 8765 -n 5000 -c 128
+        main()
+        sys.exit(0)
+    
+    async def demo() -> None:
+        # Server and client in one process, on an ephemeral port
+        server = SolverServer(workers=2)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            client = await SolverClient.connect(port=port)
+            print("Solver Server")
+            print("=" * 50)
+            print(f"word_ladder_length: {await client.call('word_ladder_length', begin_word='hit', end_word='cog', word_list=['hot', 'dot', 'dog', 'lot', 'log', 'cog'])}")
+            print(f"count_solutions(8): {await client.call('count_solutions', n=8)}")
+            print(f"has_cycle: {await client.call('has_cycle', graph={'0': [1], '1': [2], '2': [0]})}")
+            try:
+                await client.call("no_such_method")
+            except RequestError as exc:
+                print(f"error: {exc}")
+            await client.close()
+            
+            report = await load_test(sample_requests(500), concurrency=64, port=port)
+            print(f"\n{report['requests']} requests in {report['seconds']:.2f}s "
+                  f"({report['requests_per_sec']:.0f}/s), p50 {report['p50_ms']:.2f} ms, "
+                  f"p99 {report['p99_ms']:.2f} ms")
+            stats = report["server"]
+            print(f"coalesced {stats['coalesced']}, batches {stats['batches']}, errors {stats['errors']}")
+            for method, snapshot in stats["endpoints"].items():
+                print(f"  {method:<20} n={snapshot['count']:<5} p50 {snapshot['p50_ms']:.2f} ms  "
+                      f"p99 {snapshot['p99_ms']:.2f} ms")
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+    
+    asyncio.run(demo())